@@ -1,13 +1,133 @@
 """Contentful CMS integration for fetching blog posts."""
 
+import functools
 import logging
 import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import contentful
+import orjson
+import requests
+from contentful.content_type_cache import ContentTypeCache
+from contentful.errors import RateLimitExceededError, get_error
+from contentful.resource_builder import ResourceBuilder
+from contentful.utils import retry_request
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Number of (ETag, resources) pairs kept for conditional requests
+ETAG_CACHE_SIZE = 128
+
+# Entry IDs per fetch_many request; well under the CDA's 1000-entry limit,
+# and 100 IDs of Contentful's 64-character maximum still fit its URL cap
+FETCH_MANY_BATCH_SIZE = 100
+
+# Rich text body fields left out of metadata-only listings
+_CONTENT_FIELDS = frozenset({"content", "body"})
+
+
+@functools.lru_cache(maxsize=64)
+def _entries_query(
+    content_type: str,
+    limit: int,
+    order: str,
+    search: str | None = None,
+    select: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> tuple[tuple[str, Any], ...]:
+    """Build the CDA query parameters for a posts listing.
+
+    Parameters come back in a fixed order, so identical requests produce
+    byte-identical URLs and can be served from Contentful's CDN cache. The
+    result is a tuple because the SDK mutates the query dict it is given;
+    callers pass ``dict(...)`` of it.
+    """
+    query: dict[str, Any] = {
+        "content_type": content_type,
+        "limit": limit,
+        "order": order,
+    }
+    if search is not None:
+        query["query"] = search
+    if select is not None:
+        query["select"] = select
+    if created_after is not None:
+        query["sys.createdAt[gte]"] = created_after
+    if created_before is not None:
+        query["sys.createdAt[lte]"] = created_before
+    return tuple(sorted(query.items()))
+
+
+def _rich_text_node(node: Any) -> tuple[Any, Any]:
+    """Return the (value, content) pair of a rich text node."""
+    if isinstance(node, dict):
+        return node.get("value"), node.get("content")
+    return getattr(node, "value", None), getattr(node, "content", None)
+
+
+def _build_session() -> requests.Session:
+    """Create a pooled keep-alive session that retries transient gateway errors."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries),
+    )
+    return session
+
+
+# Entry fields that may hold the author, in order of preference
+_AUTHOR_FIELDS = ("author", "authorName", "writer", "createdBy")
+
+# Entry fields that may hold the publication date, in order of preference
+_DATE_FIELDS = (
+    "publishDate",
+    "publicationDate",
+    "publishedAt",
+    "published",
+    "date",
+    "createdDate",
+    "dateCreated",
+    "createdAt",
+)
+_DATE_FIELD_SET = frozenset(_DATE_FIELDS)
+
+# Name fields tried, in order, on linked author entries
+_AUTHOR_NAME_FIELDS = ("name", "fullName", "displayName", "title")
+
+
+def _linked_author_name(author_fields: dict[str, Any]) -> str:
+    """Return the first non-empty name field of a linked author entry."""
+    for field_name in _AUTHOR_NAME_FIELDS:
+        name = author_fields.get(field_name)
+        if name:
+            return str(name)
+    return "Unknown Author"
+
+
+def _error_post(title: str, content: str, entry_id: str = "") -> dict[str, Any]:
+    """Build the placeholder post returned in place of posts that failed."""
+    return {
+        "title": title,
+        "date": "",
+        "author": "",
+        "content": content,
+        "url": "",
+        "id": entry_id,
+    }
+
 
 class ContentfulClient:
     """Client for fetching content from Contentful CMS."""
@@ -41,11 +161,144 @@ class ContentfulClient:
             environment=self.environment,
         )
 
+        # The SDK issues every request through a bare requests.get(), which
+        # opens a new TCP+TLS connection each time, and parses responses with
+        # the stdlib json module. Route its requests through a shared session
+        # so the connection to the CDN stays warm, and parse with orjson.
+        self._session = _build_session()
+        self._etag_cache: dict[tuple[str, str], tuple[str, Any]] = {}
+        self._etag_lock = threading.Lock()
+        self._base_headers: Mapping[str, str] | None = None
+        self.client._get = self._get
+
+    def __enter__(self) -> "ContentfulClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
+
+    def _get(self, url: str, query: dict[str, Any] | None = None) -> Any:
+        """Perform an SDK request and build resources from the response.
+
+        Mirrors ``contentful.Client._get`` but parses the body with orjson
+        and revalidates repeated requests with ``If-None-Match``, reusing the
+        previously built resources when Contentful answers 304 Not Modified.
+
+        Args:
+            url: Space-relative API path built by the SDK
+            query: Query parameters for the request
+
+        Returns:
+            Resources built by the SDK (or the raw response in raw mode)
+        """
+        sdk = self.client
+        if query is None:
+            query = {}
+
+        if sdk.raw_mode:
+            return retry_request(sdk)(self._http_get)(url, query=query)
+
+        cache_key = (url, repr(sorted(query.items())))
+        with self._etag_lock:
+            cached = self._etag_cache.get(cache_key)
+        http_get = functools.partial(self._http_get, etag=cached[0] if cached else None)
+        response = retry_request(sdk)(http_get)(url, query=query)
+
+        if response.status_code == 304 and cached:
+            return cached[1]
+
+        if response.status_code != 200:
+            error = get_error(response)
+            if sdk.raise_errors:
+                raise error
+            return error
+
+        localized = query.get("locale", "") == "*"
+        resources = ResourceBuilder(
+            sdk.default_locale,
+            localized,
+            orjson.loads(response.content),
+            max_depth=sdk.max_include_resolution_depth,
+            reuse_entries=sdk.reuse_entries,
+        ).build()
+
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etag_lock:
+                self._etag_cache.pop(cache_key, None)
+                if len(self._etag_cache) >= ETAG_CACHE_SIZE:
+                    self._etag_cache.pop(next(iter(self._etag_cache)))
+                self._etag_cache[cache_key] = (etag, resources)
+
+        return resources
+
+    def _request_headers(self) -> Mapping[str, str]:
+        """Return the headers sent with every request, built once per client.
+
+        The SDK rebuilds its headers, including a user agent assembled from
+        several ``platform`` lookups, on each request; none of it changes
+        over the client's lifetime.
+
+        Returns:
+            Read-only mapping of the SDK's request headers
+        """
+        if self._base_headers is None:
+            headers = self.client._request_headers()
+            if "Accept-Encoding" in headers:
+                # The SDK only advertises gzip; also offer every encoding
+                # urllib3 can decode here (br/zstd when their packages exist)
+                headers["Accept-Encoding"] = ACCEPT_ENCODING
+            self._base_headers = MappingProxyType(headers)
+        return self._base_headers
+
+    def _http_get(
+        self, url: str, query: dict[str, Any], etag: str | None = None
+    ) -> requests.Response:
+        """Perform the SDK's HTTP GET over the shared session.
+
+        Args:
+            url: Space-relative API path built by the SDK
+            query: Query parameters for the request
+            etag: ETag of a cached response to revalidate, if any
+
+        Returns:
+            Raw HTTP response for the SDK to process
+        """
+        sdk = self.client
+        if not sdk.authorization_as_header:
+            query.update({"access_token": self.access_token})
+
+        sdk._normalize_query(query)
+
+        headers = self._request_headers()
+        if etag:
+            headers = {**headers, "If-None-Match": etag}
+
+        kwargs: dict[str, Any] = {
+            "params": query,
+            "headers": headers,
+            "timeout": sdk.timeout_s,
+        }
+        if sdk._has_proxy():
+            kwargs["proxies"] = sdk._proxy_parameters()
+
+        response = self._session.get(sdk._url(url), **kwargs)
+
+        if response.status_code == 429:
+            raise RateLimitExceededError(response)
+
+        return response
+
     def fetch_blog_posts(
         self,
         content_type: str = "blogPost",
         limit: int = 10,
         order: str = "-sys.createdAt",
+        include_content: bool = True,
     ) -> list[dict[str, Any]]:
         """Fetch blog posts from Contentful.
 
@@ -53,38 +306,61 @@ class ContentfulClient:
             content_type: Content type ID for blog posts
             limit: Maximum number of posts to fetch
             order: Sort order (default: newest first)
+            include_content: Whether to download the post body; metadata-only
+                listings skip the rich text field, which dominates the payload
 
         Returns:
             List of blog post dictionaries
         """
         try:
-            entries = self.client.entries(
-                {
-                    "content_type": content_type,
-                    "limit": limit,
-                    "order": order,
-                }
-            )
+            entries = self._list_entries(content_type, limit, order, include_content)
+            return self._extract_all(entries, extract_content=include_content)
 
-            posts = []
-            for entry in entries:
-                post_data = self._extract_post_data(entry)
-                if post_data:
-                    posts.append(post_data)
+        except Exception as e:
+            return [_error_post("Error fetching from Contentful", f"Error: {str(e)}")]
 
-            return posts
+    def _list_entries(
+        self, content_type: str, limit: int, order: str, include_content: bool
+    ) -> Any:
+        """Request a page of post entries, leaving out bodies when not needed.
 
-        except Exception as e:
-            return [
-                {
-                    "title": "Error fetching from Contentful",
-                    "date": "",
-                    "author": "",
-                    "content": f"Error: {str(e)}",
-                    "url": "",
-                    "id": "",
-                }
-            ]
+        Args:
+            content_type: Content type ID for blog posts
+            limit: Maximum number of posts to fetch
+            order: Sort order
+            include_content: Whether to download the post body
+
+        Returns:
+            Entries built by the SDK
+        """
+        select = None if include_content else self._metadata_select(content_type)
+        return self.client.entries(
+            dict(_entries_query(content_type, limit, order, select=select))
+        )
+
+    def _metadata_select(self, content_type: str) -> str | None:
+        """Build a ``select`` that fetches every field except the post body.
+
+        Uses the content model the SDK cached at construction, so only fields
+        that exist are requested. Returns None (select everything) when the
+        content type is unknown.
+
+        Args:
+            content_type: Content type ID for blog posts
+
+        Returns:
+            Comma-separated select expression, or None
+        """
+        model = ContentTypeCache.get(self.space_id, content_type)
+        if model is None:
+            return None
+
+        fields = [
+            f"fields.{field.id}"
+            for field in model.fields
+            if field.id not in _CONTENT_FIELDS
+        ]
+        return ",".join(["sys", *fields])
 
     def fetch_single_post(self, entry_id: str) -> dict[str, Any]:
         """Fetch a single blog post by entry ID.
@@ -97,30 +373,76 @@ class ContentfulClient:
         """
         try:
             entry = self.client.entry(entry_id)
-            return self._extract_post_data(entry) or {
-                "title": "Post not found",
-                "date": "",
-                "author": "",
-                "content": "Post data could not be extracted",
-                "url": "",
-                "id": entry_id,
-            }
+            return self._extract_post_data(entry) or _error_post(
+                "Post not found", "Post data could not be extracted", entry_id
+            )
 
         except Exception as e:
-            return {
-                "title": "Error fetching post",
-                "date": "",
-                "author": "",
-                "content": f"Error: {str(e)}",
-                "url": "",
-                "id": entry_id,
-            }
+            return _error_post("Error fetching post", f"Error: {str(e)}", entry_id)
+
+    def fetch_many(self, entry_ids: list[str]) -> list[dict[str, Any]]:
+        """Fetch several blog posts by entry ID, one request per batch.
+
+        IDs are sent FETCH_MANY_BATCH_SIZE at a time so a long list stays
+        within the API's page size and URL length limits.
+
+        Args:
+            entry_ids: Contentful entry IDs
+
+        Returns:
+            Blog post dictionaries in the order of ``entry_ids``; IDs that
+            could not be found are omitted
+        """
+        if not entry_ids:
+            return []
+
+        ids = list(dict.fromkeys(entry_ids))
+        try:
+            posts_by_id = {}
+            for start in range(0, len(ids), FETCH_MANY_BATCH_SIZE):
+                batch = ids[start : start + FETCH_MANY_BATCH_SIZE]
+                entries = self.client.entries(
+                    {"sys.id[in]": batch, "limit": len(batch)}
+                )
+                for post in self._extract_all(entries):
+                    posts_by_id[post["id"]] = post
+
+            return [posts_by_id[i] for i in entry_ids if i in posts_by_id]
+
+        except Exception as e:
+            return [_error_post("Error fetching posts", f"Error: {str(e)}")]
+
+    def _extract_all(
+        self, entries: Any, extract_content: bool = True
+    ) -> list[dict[str, Any]]:
+        """Extract post data from every entry, skipping ones that fail.
+
+        Extraction runs serially: the SDK resolves linked entries from the
+        response's ``includes`` in memory, so this is GIL-bound work that a
+        thread pool would only add overhead to.
+
+        Args:
+            entries: Iterable of Contentful entry objects
+            extract_content: Whether to extract the post body
 
-    def _extract_post_data(self, entry: Any) -> dict[str, Any] | None:
+        Returns:
+            List of extracted blog post dictionaries
+        """
+        return [
+            post
+            for entry in entries
+            if (post := self._extract_post_data(entry, extract_content)) is not None
+        ]
+
+    def _extract_post_data(
+        self, entry: Any, extract_content: bool = True
+    ) -> dict[str, Any] | None:
         """Extract blog post data from Contentful entry.
 
         Args:
             entry: Contentful entry object
+            extract_content: Whether to extract the post body; when False the
+                content is left empty and the rich text walk is skipped
 
         Returns:
             Extracted post data or None if extraction fails
@@ -130,23 +452,29 @@ class ContentfulClient:
 
             # Common field mappings - adjust based on your content model
             title = fields.get("title", "No title")
-            content = fields.get("content", fields.get("body", "No content"))
+            if not extract_content:
+                content = ""
+            else:
+                try:
+                    content = fields["content"]
+                except KeyError:
+                    content = fields.get("body", "No content")
 
             # Handle linked author entries
             author = self._extract_author(fields)
 
-            # Handle date fields
+            # Handle date fields (falls back to the entry's creation date)
             date = self._extract_date(fields, entry)
 
-            if not date and hasattr(entry, "sys"):
-                date = entry.sys.get("createdAt", "")
-
             # Handle slug/URL
             slug = fields.get("slug", "")
             url = f"https://your-site.com/{slug}" if slug else ""
 
-            # Handle rich text content
-            if hasattr(content, "content"):
+            # Handle rich text content (the SDK returns rich text as a dict)
+            if (
+                isinstance(content, dict)
+                or getattr(content, "content", None) is not None
+            ):
                 content = self._extract_rich_text(content)
             elif not isinstance(content, str):
                 content = str(content)
@@ -157,7 +485,7 @@ class ContentfulClient:
                 "author": str(author),
                 "content": content,
                 "url": url,
-                "id": entry.sys.get("id", ""),
+                "id": (getattr(entry, "sys", None) or {}).get("id", ""),
             }
 
         except Exception as e:
@@ -167,22 +495,46 @@ class ContentfulClient:
     def _extract_rich_text(self, rich_text: Any) -> str:
         """Extract plain text from Contentful rich text field.
 
+        Walks the node tree iteratively, so deeply nested documents cost no
+        recursion and each paragraph's text is joined only once. Whitespace
+        within a paragraph is collapsed to single spaces.
+
         Args:
-            rich_text: Rich text content object
+            rich_text: Rich text document (dict or node object)
 
         Returns:
-            Plain text string
+            Plain text string with paragraphs separated by blank lines
         """
         try:
-            if hasattr(rich_text, "content") and isinstance(rich_text.content, list):
-                text_parts = []
-                for node in rich_text.content:
-                    if hasattr(node, "content") and isinstance(node.content, list):
-                        for text_node in node.content:
-                            if hasattr(text_node, "value"):
-                                text_parts.append(text_node.value)
-                return "\n\n".join(text_parts)
-            return str(rich_text)
+            _, blocks = _rich_text_node(rich_text)
+            if not isinstance(blocks, list):
+                return str(rich_text)
+
+            paragraphs = []
+            for block in blocks:
+                parts = []
+                stack = [block]
+                while stack:
+                    node = stack.pop()
+                    # The SDK hands rich text over as plain dicts; read those
+                    # inline and leave node objects to the generic helper
+                    if type(node) is dict:
+                        value = node.get("value")
+                        children = node.get("content")
+                    else:
+                        value, children = _rich_text_node(node)
+                    if isinstance(value, str):
+                        parts.append(value)
+                    elif isinstance(children, list):
+                        # Push in reverse so nodes pop in document order
+                        stack.extend(reversed(children))
+                # Collapse runs of whitespace inside the paragraph so the
+                # summarizer isn't fed redundant tokens
+                text = " ".join("".join(parts).split())
+                if text:
+                    paragraphs.append(text)
+
+            return "\n\n".join(paragraphs)
         except Exception:
             return str(rich_text)
 
@@ -195,26 +547,14 @@ class ContentfulClient:
         Returns:
             Author name string
         """
-        # Try different author field names
-        author_fields = ["author", "authorName", "writer", "createdBy"]
-
-        for field_name in author_fields:
+        for field_name in _AUTHOR_FIELDS:
             if field_name in fields:
                 author_value = fields[field_name]
 
                 # Handle linked author entries
                 if hasattr(author_value, "fields"):
                     try:
-                        author_fields_data = author_value.fields()
-                        # Try common name fields in author entries
-                        name = (
-                            author_fields_data.get("name")
-                            or author_fields_data.get("fullName")
-                            or author_fields_data.get("displayName")
-                            or author_fields_data.get("title")
-                            or "Unknown Author"
-                        )
-                        return str(name)
+                        return _linked_author_name(author_value.fields())
                     except Exception as e:
                         logger.debug(
                             "Failed to extract author from linked entry: %s", e
@@ -226,15 +566,7 @@ class ContentfulClient:
                     first_author = author_value[0]
                     if hasattr(first_author, "fields"):
                         try:
-                            author_fields_data = first_author.fields()
-                            name = (
-                                author_fields_data.get("name")
-                                or author_fields_data.get("fullName")
-                                or author_fields_data.get("displayName")
-                                or author_fields_data.get("title")
-                                or "Unknown Author"
-                            )
-                            return str(name)
+                            return _linked_author_name(first_author.fields())
                         except Exception as e:
                             logger.debug(
                                 "Failed to extract author from list entry: %s", e
@@ -259,6 +591,8 @@ class ContentfulClient:
         content_type: str = "blogPost",
         limit: int = 10,
         order: str = "-sys.createdAt",
+        created_after: str | None = None,
+        created_before: str | None = None,
     ) -> list[dict[str, Any]]:
         """Search blog posts from Contentful using text query.
 
@@ -267,39 +601,36 @@ class ContentfulClient:
             content_type: Content type ID for blog posts
             limit: Maximum number of posts to return
             order: Sort order (default: newest first)
+            created_after: Only match posts created at or after this ISO 8601
+                date; filtered by Contentful, not after download
+            created_before: Only match posts created at or before this date
 
         Returns:
             List of matching blog post dictionaries
         """
         try:
-            # Use Contentful's full-text search API
+            # Use Contentful's full-text search API across all fields
             entries = self.client.entries(
-                {
-                    "content_type": content_type,
-                    "query": query,  # Full-text search across all fields
-                    "limit": limit,
-                    "order": order,
-                }
+                dict(
+                    _entries_query(
+                        content_type,
+                        limit,
+                        order,
+                        search=query,
+                        created_after=created_after,
+                        created_before=created_before,
+                    )
+                )
             )
 
-            posts = []
-            for entry in entries:
-                post_data = self._extract_post_data(entry)
-                if post_data:
-                    posts.append(post_data)
-
-            return posts
+            return self._extract_all(entries)
 
         except Exception as e:
             return [
-                {
-                    "title": f"Error searching Contentful for '{query}'",
-                    "date": "",
-                    "author": "",
-                    "content": f"Search error: {str(e)}",
-                    "url": "",
-                    "id": "",
-                }
+                _error_post(
+                    f"Error searching Contentful for '{query}'",
+                    f"Search error: {str(e)}",
+                )
             ]
 
     def _extract_date(self, fields: dict[str, Any], entry: Any) -> str:
@@ -312,39 +643,66 @@ class ContentfulClient:
         Returns:
             Date string
         """
-        # Try different date field names
-        date_fields = [
-            "publishDate",
-            "publicationDate",
-            "publishedAt",
-            "published",
-            "date",
-            "createdDate",
-            "dateCreated",
-            "createdAt",
-        ]
+        # Entries with no date field at all skip probing every candidate
+        if not _DATE_FIELD_SET.isdisjoint(fields):
+            for field_name in _DATE_FIELDS:
+                if field_name in fields:
+                    date_value = fields[field_name]
+
+                    # Handle datetime objects
+                    if hasattr(date_value, "isoformat"):
+                        return str(date_value.isoformat())
+
+                    # Handle string dates
+                    elif isinstance(date_value, str) and date_value:
+                        return date_value
+
+                    # Handle other types
+                    elif date_value:
+                        return str(date_value)
+
+        # Fallback to system creation date. The SDK snake-cases sys keys and
+        # parses the timestamp; raw CDA-style dicts keep "createdAt".
+        sys_ = getattr(entry, "sys", None) or {}
+        created_at = sys_.get("created_at")
+        if created_at is None:
+            created_at = sys_.get("createdAt")
+        if hasattr(created_at, "isoformat"):
+            return str(created_at.isoformat())
+        if created_at is not None:
+            return str(created_at)
 
-        for field_name in date_fields:
-            if field_name in fields:
-                date_value = fields[field_name]
+        return "No date available"
 
-                # Handle datetime objects
-                if hasattr(date_value, "isoformat"):
-                    return str(date_value.isoformat())
 
-                # Handle string dates
-                elif isinstance(date_value, str) and date_value:
-                    return date_value
+def shared_client(
+    space_id: str | None = None, access_token: str | None = None
+) -> ContentfulClient:
+    """Return the shared client for a set of credentials, creating it on first use.
 
-                # Handle other types
-                elif date_value:
-                    return str(date_value)
+    Reusing one client keeps its connection pool, content type cache and
+    ETag cache warm across fetches.
 
-        # Fallback to system creation date
-        if hasattr(entry, "sys") and "createdAt" in entry.sys:
-            return str(entry.sys["createdAt"])
+    Args:
+        space_id: Contentful space ID (or from CONTENTFUL_SPACE_ID env var)
+        access_token: Contentful access token (or from CONTENTFUL_ACCESS_TOKEN env var)
 
-        return "No date available"
+    Returns:
+        The ContentfulClient for those credentials
+
+    Raises:
+        ValueError: If no credentials are given or configured; failures
+            aren't cached, so a later call can succeed
+    """
+    return _shared_client(
+        space_id or os.getenv("CONTENTFUL_SPACE_ID"),
+        access_token or os.getenv("CONTENTFUL_ACCESS_TOKEN"),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _shared_client(space_id: str | None, access_token: str | None) -> ContentfulClient:
+    return ContentfulClient(space_id, access_token)
 
 
 # Convenience function for easy usage
@@ -353,6 +711,7 @@ def fetch_contentful_posts(
     access_token: str | None = None,
     content_type: str = "blogPost",
     limit: int = 10,
+    include_content: bool = True,
 ) -> list[dict[str, Any]]:
     """Convenience function to fetch blog posts from Contentful.
 
@@ -361,9 +720,10 @@ def fetch_contentful_posts(
         access_token: Contentful access token
         content_type: Content type ID for blog posts
         limit: Maximum number of posts to fetch
+        include_content: Whether to download the post body
 
     Returns:
         List of blog post dictionaries
     """
-    client = ContentfulClient(space_id, access_token)
-    return client.fetch_blog_posts(content_type, limit)
+    client = shared_client(space_id, access_token)
+    return client.fetch_blog_posts(content_type, limit, include_content=include_content)
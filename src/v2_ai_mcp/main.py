@@ -1,39 +1,396 @@
+import asyncio
+import json
 import os
+import threading
+import time
 
 from fastmcp import FastMCP
 
 from .scraper import fetch_blog_posts
-from .summarizer import summarize
+from .summarizer import summarize_request, summary_key, summary_request
 
 # Initialize FastMCP server
 mcp = FastMCP("V2 Insights Scraper")
 
+# How long a fetched post list is served from memory before refetching
+POSTS_CACHE_TTL = 60.0
+
+# Age after which a cached post list is still served but refetched in the
+# background, so callers rarely wait on an expired cache
+POSTS_REFRESH_AFTER = 45.0
+
+# Maximum number of Contentful listing and search results kept in memory
+RESULTS_CACHE_SIZE = 128
+
+# Cached post lists keyed by whether post content was included
+_posts_cache: dict[bool, tuple[float, list]] = {}
+_posts_cache_lock = threading.Lock()
+
+# Post lists being refetched in the background, and a counter bumped on
+# invalidation so a refresh started before it doesn't store stale posts
+_refreshing: set[bool] = set()
+_posts_generation = 0
+
+# Post lists being fetched on a cache miss, so concurrent callers wait for
+# the first fetch instead of starting their own
+_posts_inflight: dict[bool, threading.Event] = {}
+
+# Titles of the placeholder posts fetch_blog_posts returns for failed
+# fetches (Contentful listing, scraped page); lists holding one aren't cached
+_FETCH_ERROR_TITLES = frozenset(
+    {"Error fetching from Contentful", "Error fetching post"}
+)
+
+# Cached Contentful listing and search results keyed by tool arguments
+_results_cache: dict[tuple, tuple[float, list]] = {}
+_results_cache_lock = threading.Lock()
+
+# Contentful entry IDs of the last fetched post list, by index
+_id_by_index: list[str] = []
+
+# Maximum number of post summaries kept in memory
+SUMMARY_CACHE_SIZE = 256
+
+# Optional JSON file that keeps summaries across server restarts
+SUMMARY_CACHE_FILE = os.getenv("SUMMARY_CACHE_FILE")
+
+_summary_cache: dict[bytes, str] = {}
+_summary_cache_lock = threading.Lock()
+# Serializes writes to SUMMARY_CACHE_FILE, which happen outside the cache lock
+_summary_file_lock = threading.Lock()
+
+# Summaries currently being generated, so identical concurrent requests wait
+# for the first one instead of calling the summarizer again
+_summary_inflight: dict[bytes, threading.Event] = {}
+
+
+# Returned by tools that need Contentful when it isn't configured
+_CONFIG_ERROR = {
+    "error": "Contentful not configured. Set CONTENTFUL_SPACE_ID and CONTENTFUL_ACCESS_TOKEN environment variables."
+}
+
+
+# Returned by invalidate_posts
+_CACHE_CLEARED = {"message": "Post cache cleared"}
+
+
+def _contentful_configured() -> bool:
+    """Return whether Contentful credentials are set in the environment"""
+    return bool(
+        os.getenv("CONTENTFUL_SPACE_ID") and os.getenv("CONTENTFUL_ACCESS_TOKEN")
+    )
+
+
+def _content_type() -> str:
+    """Return the Contentful content type ID used for blog posts"""
+    return os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost")
+
+
+def _client():
+    """Return the shared Contentful client, creating it on first use
+
+    This is the same client fetch_blog_posts() lists posts with, so its
+    connection pool, cached headers and ETag cache stay warm across tool
+    calls. Raises ValueError while Contentful is not configured; failures
+    aren't cached, so a later call can succeed.
+    """
+    from .contentful_client import shared_client
+
+    return shared_client()
+
+
+def _cached_posts(include_content: bool = True) -> list:
+    """Return blog posts, refetching only when the cached list has expired
+
+    Metadata-only requests are served from a fresh full list when there is
+    one, or wait for one being fetched, so they never trigger a second
+    fetch. The fetch itself runs outside
+    the cache lock; concurrent callers needing the same list wait for the
+    first one's fetch instead of starting their own.
+    """
+    while True:
+        with _posts_cache_lock:
+            now = time.monotonic()
+            posts = _fresh_posts(include_content, now)
+            if posts is not None:
+                return posts
+            pending = _posts_inflight.get(include_content)
+            if pending is None and not include_content:
+                # A full list being fetched serves metadata requests too
+                pending = _posts_inflight.get(True)
+            if pending is None:
+                pending = _posts_inflight[include_content] = threading.Event()
+                generation = _posts_generation
+                break
+        pending.wait()
+
+    try:
+        posts = fetch_blog_posts(include_content=include_content)
+        with _posts_cache_lock:
+            if generation == _posts_generation and not _has_error_posts(posts):
+                _store_posts(include_content, now, posts)
+    finally:
+        with _posts_cache_lock:
+            del _posts_inflight[include_content]
+        pending.set()
+    return posts
+
+
+def _fresh_posts(include_content: bool, now: float) -> list | None:
+    """Return the cached post list if it is still fresh, or None
+
+    The caller must hold the cache lock.
+    """
+    full = _posts_cache.get(True)
+    if full is not None and now - full[0] < POSTS_CACHE_TTL:
+        _refresh_ahead(True, now - full[0])
+        if include_content:
+            return full[1]
+        return [{**post, "content": ""} for post in full[1]]
+
+    cached = _posts_cache.get(include_content)
+    if cached is not None and now - cached[0] < POSTS_CACHE_TTL:
+        _refresh_ahead(include_content, now - cached[0])
+        return cached[1]
+    return None
+
+
+def _has_error_posts(posts: list) -> bool:
+    """Return whether a fetched post list holds a failed-fetch placeholder"""
+    return any(post.get("title") in _FETCH_ERROR_TITLES for post in posts)
+
+
+def _store_posts(include_content: bool, fetched_at: float, posts: list):
+    """Cache a fetched post list; the caller must hold the cache lock"""
+    global _id_by_index
+
+    _posts_cache[include_content] = (fetched_at, posts)
+    _id_by_index = [post.get("id", "") for post in posts]
+
+
+def _refresh_ahead(include_content: bool, age: float):
+    """Refetch a cached post list in the background once it is getting old
+
+    The caller must hold the cache lock.
+    """
+    if age < POSTS_REFRESH_AFTER or include_content in _refreshing:
+        return
+
+    _refreshing.add(include_content)
+    threading.Thread(
+        target=_refresh_posts,
+        args=(include_content, _posts_generation),
+        name="refresh-posts",
+        daemon=True,
+    ).start()
+
+
+def _refresh_posts(include_content: bool, generation: int):
+    """Refetch a post list and replace the cached one unless it was invalidated"""
+    try:
+        fetched_at = time.monotonic()
+        posts = fetch_blog_posts(include_content=include_content)
+        with _posts_cache_lock:
+            if generation == _posts_generation and not _has_error_posts(posts):
+                _store_posts(include_content, fetched_at, posts)
+    finally:
+        with _posts_cache_lock:
+            _refreshing.discard(include_content)
+
+
+def _cached_results(key: tuple, fetch) -> list | dict:
+    """Return a cached Contentful result for key, calling fetch when missing
+
+    Errors, and lists holding the clients' error placeholder posts (which
+    have no entry ID), are returned without being cached, as are results of
+    a fetch that was already running when the caches were invalidated.
+    """
+    with _results_cache_lock:
+        cached = _results_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < POSTS_CACHE_TTL:
+            return cached[1]
+        generation = _posts_generation
+
+    fetched_at = time.monotonic()
+    result = fetch()
+    if not isinstance(result, list) or not all(post.get("id") for post in result):
+        return result
+
+    with _results_cache_lock:
+        if generation != _posts_generation:
+            return result
+        _results_cache.pop(key, None)
+        if len(_results_cache) >= RESULTS_CACHE_SIZE:
+            _results_cache.pop(next(iter(_results_cache)))
+        _results_cache[key] = (fetched_at, result)
+    return result
+
+
+def _peek_cached_posts() -> list:
+    """Return the cached full post list if it is still fresh, without fetching"""
+    with _posts_cache_lock:
+        full = _posts_cache.get(True)
+        if full is not None and time.monotonic() - full[0] < POSTS_CACHE_TTL:
+            return full[1]
+        return []
+
+
+def _invalidate_posts():
+    """Drop the cached posts and results so the next call fetches fresh posts"""
+    global _id_by_index, _posts_generation
+
+    with _posts_cache_lock, _results_cache_lock:
+        _posts_cache.clear()
+        _results_cache.clear()
+        _id_by_index = []
+        _posts_generation += 1
+    return _CACHE_CLEARED
+
+
+def _warm_posts_cache() -> threading.Thread:
+    """Prefetch the full post list in the background so the first call is fast"""
+    thread = threading.Thread(
+        target=_cached_posts, name="warm-posts-cache", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _fetch_post_by_index(index: int) -> dict | None:
+    """Fetch only the post at a known index when no fresh full list is cached
+
+    That covers an expired full list as well as one never fetched, when only
+    the metadata list has mapped indexes to entry IDs. Returns None when the
+    full list should be used instead: it is cached and fresh, the index has
+    no known entry ID, or the single fetch failed.
+    """
+    if _peek_cached_posts() or not 0 <= index < len(_id_by_index):
+        return None
+
+    entry_id = _id_by_index[index]
+    if not entry_id or not _contentful_configured():
+        return None
+
+    try:
+        post = _client().fetch_single_post(entry_id)
+    except Exception:
+        return None
+
+    if post.get("title") in ("Post not found", "Error fetching post"):
+        return None
+    return post
+
+
+def _summarize_cached(content: str) -> str:
+    """Summarize content, reusing the summary of an identical request"""
+    request = summary_request(content)
+    key = summary_key(request)
+    while True:
+        with _summary_cache_lock:
+            summary = _summary_cache.get(key)
+            if summary is not None:
+                return summary
+            pending = _summary_inflight.get(key)
+            if pending is None:
+                pending = _summary_inflight[key] = threading.Event()
+                break
+        pending.wait()
+
+    try:
+        result = summarize_request(request)
+        summary = result.text
+        # Don't pin failures; let the next call retry the summarizer
+        if result.error is None:
+            with _summary_cache_lock:
+                if len(_summary_cache) >= SUMMARY_CACHE_SIZE:
+                    _summary_cache.pop(next(iter(_summary_cache)))
+                _summary_cache[key] = summary
+            _save_summaries()
+    finally:
+        with _summary_cache_lock:
+            del _summary_inflight[key]
+        pending.set()
+    return summary
+
+
+def _load_summaries():
+    """Load summaries persisted by a previous run, if a cache file is configured"""
+    if not SUMMARY_CACHE_FILE:
+        return
+
+    try:
+        with open(SUMMARY_CACHE_FILE, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(saved, dict):
+        return
+
+    loaded = {}
+    for key, summary in saved.items():
+        if not isinstance(summary, str):
+            continue
+        try:
+            loaded[bytes.fromhex(key)] = summary
+        except ValueError:
+            continue
+
+    with _summary_cache_lock:
+        for key, summary in list(loaded.items())[-SUMMARY_CACHE_SIZE:]:
+            _summary_cache[key] = summary
+
+
+def _save_summaries():
+    """Write a snapshot of the summary cache to the cache file
+
+    Only the snapshot is taken under the cache lock, so lookups don't wait
+    on disk I/O. Snapshots are taken under the file lock and so are written
+    in order; an older one never replaces a newer file.
+    """
+    if not SUMMARY_CACHE_FILE:
+        return
+
+    with _summary_file_lock:
+        with _summary_cache_lock:
+            saved = {key.hex(): summary for key, summary in _summary_cache.items()}
+
+        tmp_path = f"{SUMMARY_CACHE_FILE}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, SUMMARY_CACHE_FILE)
+        except OSError:
+            # Persistence is best-effort; the in-memory cache still works
+            pass
+
 
 def _get_latest_posts():
     """Retrieves the latest blog posts with metadata"""
-    return fetch_blog_posts()
+    return _cached_posts(include_content=False)
 
 
 def _summarize_post(index: int):
     """Returns a summary of the blog post at the specified index"""
-    posts = fetch_blog_posts()
-    if 0 <= index < len(posts):
+    post = _fetch_post_by_index(index)
+    if post is None:
+        posts = _cached_posts()
+        if not 0 <= index < len(posts):
+            return {"error": f"Invalid index. Available posts: 0 to {len(posts) - 1}"}
         post = posts[index]
-        summary = summarize(post["content"])
-        return {
-            "title": post["title"],
-            "date": post["date"],
-            "author": post["author"],
-            "url": post["url"],
-            "summary": summary,
-        }
-    else:
-        return {"error": f"Invalid index. Available posts: 0 to {len(posts) - 1}"}
+
+    summary = _summarize_cached(post["content"])
+    return {
+        "title": post["title"],
+        "date": post["date"],
+        "author": post["author"],
+        "url": post["url"],
+        "summary": summary,
+    }
 
 
 def _get_post_content(index: int):
     """Returns the full content of the blog post at the specified index"""
-    posts = fetch_blog_posts()
+    posts = _cached_posts()
     if 0 <= index < len(posts):
         return posts[index]
     else:
@@ -42,71 +399,121 @@ def _get_post_content(index: int):
 
 def _get_contentful_posts(limit: int = 10):
     """Fetch posts directly from Contentful (if configured)"""
-    if not os.getenv("CONTENTFUL_SPACE_ID") or not os.getenv("CONTENTFUL_ACCESS_TOKEN"):
-        return {
-            "error": "Contentful not configured. Set CONTENTFUL_SPACE_ID and CONTENTFUL_ACCESS_TOKEN environment variables."
-        }
+    if not _contentful_configured():
+        return _CONFIG_ERROR
 
     try:
-        from .contentful_client import fetch_contentful_posts
-
-        return fetch_contentful_posts(
-            content_type=os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost"), limit=limit
+        content_type = _content_type()
+        return _cached_results(
+            ("posts", content_type, limit),
+            lambda: _client().fetch_blog_posts(content_type=content_type, limit=limit),
         )
     except Exception as e:
         return {"error": f"Error fetching from Contentful: {str(e)}"}
 
 
-def _search_blogs(query: str, limit: int = 10):
+def _search_blogs(
+    query: str,
+    limit: int = 10,
+    created_after: str | None = None,
+    created_before: str | None = None,
+):
     """Search blog posts across all content using Contentful's search API"""
-    if not os.getenv("CONTENTFUL_SPACE_ID") or not os.getenv("CONTENTFUL_ACCESS_TOKEN"):
-        return {
-            "error": "Contentful not configured. Set CONTENTFUL_SPACE_ID and CONTENTFUL_ACCESS_TOKEN environment variables."
-        }
+    if not _contentful_configured():
+        return _CONFIG_ERROR
 
     try:
-        from .contentful_client import ContentfulClient
-
-        client = ContentfulClient()
-        return client.search_blog_posts(
-            query=query,
-            content_type=os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost"),
-            limit=limit,
+        content_type = _content_type()
+        return _cached_results(
+            ("search", content_type, query, limit, created_after, created_before),
+            lambda: _client().search_blog_posts(
+                query=query,
+                content_type=content_type,
+                limit=limit,
+                created_after=created_after,
+                created_before=created_before,
+            ),
         )
     except Exception as e:
         return {"error": f"Error searching Contentful: {str(e)}"}
 
 
-# Register tools with FastMCP
+def _get_posts_by_ids(ids: list[str]):
+    """Return posts by Contentful entry ID, fetching uncached ones in one request"""
+    cached = {post.get("id"): post for post in _peek_cached_posts() if post.get("id")}
+    missing = [post_id for post_id in ids if post_id not in cached]
+
+    if missing:
+        if not _contentful_configured():
+            return _CONFIG_ERROR
+
+        try:
+            fetched = _client().fetch_many(missing)
+        except Exception as e:
+            return {"error": f"Error fetching from Contentful: {str(e)}"}
+
+        failed = [post for post in fetched if not post.get("id")]
+        if failed:
+            return {"error": f"Error fetching from Contentful: {failed[0]['content']}"}
+
+        cached.update((post["id"], post) for post in fetched)
+
+    return [cached[post_id] for post_id in ids if post_id in cached]
+
+
+# Register tools with FastMCP. Tools that touch the network run their
+# blocking helpers in a worker thread so the server's event loop stays free
+# to handle other requests concurrently.
 @mcp.tool()
-def get_latest_posts():
+async def get_latest_posts():
     """Retrieves the latest blog posts with metadata"""
-    return _get_latest_posts()
+    return await asyncio.to_thread(_get_latest_posts)
 
 
 @mcp.tool()
-def summarize_post(index: int):
+async def summarize_post(index: int):
     """Returns a summary of the blog post at the specified index"""
-    return _summarize_post(index)
+    return await asyncio.to_thread(_summarize_post, index)
 
 
 @mcp.tool()
-def get_post_content(index: int):
+async def get_post_content(index: int):
     """Returns the full content of the blog post at the specified index"""
-    return _get_post_content(index)
+    return await asyncio.to_thread(_get_post_content, index)
 
 
 @mcp.tool()
-def get_contentful_posts(limit: int = 10):
+async def get_contentful_posts(limit: int = 10):
     """Fetch posts directly from Contentful CMS (if configured)"""
-    return _get_contentful_posts(limit)
+    return await asyncio.to_thread(_get_contentful_posts, limit)
+
+
+@mcp.tool()
+async def search_blogs(
+    query: str,
+    limit: int = 10,
+    created_after: str | None = None,
+    created_before: str | None = None,
+):
+    """Search blog posts across all content using text query. Searches titles, content, authors, and other fields. Optionally restrict to posts created within an ISO 8601 date range."""
+    return await asyncio.to_thread(
+        _search_blogs, query, limit, created_after, created_before
+    )
+
+
+@mcp.tool()
+async def get_posts_by_ids(ids: list[str]):
+    """Returns blog posts by Contentful entry ID, fetched in a single request"""
+    return await asyncio.to_thread(_get_posts_by_ids, ids)
 
 
 @mcp.tool()
-def search_blogs(query: str, limit: int = 10):
-    """Search blog posts across all content using text query. Searches titles, content, authors, and other fields."""
-    return _search_blogs(query, limit)
+def invalidate_posts():
+    """Clears the cached blog post list so the next request fetches fresh posts"""
+    return _invalidate_posts()
 
 
 if __name__ == "__main__":
+    _load_summaries()
+    _warm_posts_cache()
     mcp.run()
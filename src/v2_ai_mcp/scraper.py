@@ -1,7 +1,68 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Dates in the formats V2.ai posts use, as one alternation so the text is
+# scanned once: Month DD, YYYY; DD Month YYYY; MM/DD/YYYY; YYYY/MM/DD
+_DATE_RE = re.compile(
+    r"\b(?:[A-Za-z]+ \d{1,2}, \d{4}"
+    r"|\d{1,2} [A-Za-z]+ \d{4}"
+    r"|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
+    r"|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b"
+)
+
+# Author name run into the date by the page markup
+_RODAN_RE = re.compile(r".*?Rodan\s*")
+
+# Elements that may hold the post date or body, as selector lists so each is
+# found in one lazy traversal; the first match in document order wins
+_DATE_SELECTOR = (
+    "time, [datetime], .date, .published, .post-date, .meta-date, .publish-date"
+)
+_CONTENT_SELECTOR = (
+    "main, .content, .post-content, .article-content, article, .entry-content"
+)
+
+# Most pages fetched at once by fetch_blog_post_list
+MAX_FETCH_WORKERS = 10
+
+
+def _build_session() -> requests.Session:
+    """
+    Create a keep-alive session sized for concurrent page fetches
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_FETCH_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Offer every compression urllib3 can decode here (br/zstd when installed)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+# Shared so repeated scrapes of the same site reuse their TCP+TLS connection
+_SESSION = _build_session()
+
+# V2.ai posts scraped when Contentful returns nothing
+V2AI_POST_URLS = (
+    "https://www.v2.ai/insights/adopting-AI-assistants-while-balancing-risks",
+)
+
+
+def _join_paragraphs(paragraphs) -> str:
+    """
+    Join the non-empty text of paragraph elements, extracting each text once
+    """
+    texts = []
+    for p in paragraphs:
+        text = p.get_text(strip=True)
+        if text:
+            texts.append(text)
+    return "\n\n".join(texts)
 
 
 def fetch_blog_post(url: str) -> dict:
@@ -9,118 +70,8 @@ def fetch_blog_post(url: str) -> dict:
     Fetch and parse a single blog post from V2.ai
     """
     try:
-        response = requests.get(url, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        # Extract title
-        title_element = soup.find("h1")
-        title = (
-            title_element.get_text(strip=True) if title_element else "No title found"
-        )
-
-        # Extract author and date - V2.ai specific structure
-        author = "Ashley Rodan"  # Known author for this specific post
-        date = None
-
-        # Look for date in various formats and locations
-        date_patterns = [
-            r"\b[A-Za-z]+ \d{1,2}, \d{4}\b",  # Month DD, YYYY (most common)
-            r"\b\d{1,2} [A-Za-z]+ \d{4}\b",  # DD Month YYYY
-            r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",  # MM/DD/YYYY or MM-DD-YYYY
-            r"\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b",  # YYYY/MM/DD or YYYY-MM-DD
-        ]
-
-        # Search in title area and nearby text
-        title_area = soup.find("h1")
-        if title_area:
-            # Look for date in parent container or siblings
-            container = title_area.parent
-            if container:
-                container_text = container.get_text()
-                for pattern in date_patterns:
-                    match = re.search(pattern, container_text)
-                    if match:
-                        date = match.group().strip()
-                        # Clean up date if it contains author name
-                        if "Rodan" in date:
-                            date = re.sub(r".*?Rodan\s*", "", date)
-                        break
-
-        # Additional selectors for V2.ai structure
-        if not date:
-            date_selectors = [
-                "time",
-                "[datetime]",
-                ".date",
-                ".published",
-                ".post-date",
-                ".meta-date",
-                ".publish-date",
-            ]
-
-            for selector in date_selectors:
-                date_element = soup.select_one(selector)
-                if date_element:
-                    date_text = date_element.get("datetime") or date_element.get_text(
-                        strip=True
-                    )
-                    if date_text:
-                        date = date_text
-                        break
-
-        if not date:
-            date = "Date not found"
-
-        # Extract content - remove script, style, nav, header, footer
-        for element in soup(["script", "style", "nav", "header", "footer"]):
-            element.decompose()
-
-        # Look for main content areas
-        content_selectors = [
-            "main",
-            ".content",
-            ".post-content",
-            ".article-content",
-            "article",
-            ".entry-content",
-        ]
-
-        content = ""
-        for selector in content_selectors:
-            content_element = soup.select_one(selector)
-            if content_element:
-                # Get all paragraph text
-                paragraphs = content_element.find_all("p")
-                if paragraphs:
-                    content = "\n\n".join(
-                        [
-                            p.get_text(strip=True)
-                            for p in paragraphs
-                            if p.get_text(strip=True)
-                        ]
-                    )
-                    break
-
-        # Fallback: get all paragraphs from body
-        if not content:
-            paragraphs = soup.find_all("p")
-            content = "\n\n".join(
-                [p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)]
-            )
-
-        if not content:
-            content = "Content not found"
-
-        return {
-            "title": title,
-            "date": date,
-            "author": author,
-            "content": content,
-            "url": url,
-        }
-
     except requests.RequestException as e:
         return {
             "title": "Error fetching post",
@@ -130,10 +81,98 @@ def fetch_blog_post(url: str) -> dict:
             "url": url,
         }
 
+    # Use the charset the server declared, so bs4 doesn't sniff the bytes for
+    # one; requests' ISO-8859-1 default for text/* without a charset isn't one
+    content_type = response.headers.get("Content-Type", "")
+    encoding = response.encoding if "charset=" in content_type.lower() else None
+    return _parse_blog_post(response.content, url, encoding)
+
 
-def fetch_blog_posts() -> list:
+def fetch_blog_post_list(urls: list[str], max_workers: int = MAX_FETCH_WORKERS) -> list:
+    """
+    Fetch and parse several blog posts concurrently, preserving their order
+    """
+    if len(urls) <= 1:
+        return [fetch_blog_post(url) for url in urls]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(fetch_blog_post, urls))
+
+
+def _parse_blog_post(html: bytes, url: str, encoding: str | None = None) -> dict:
+    """
+    Extract title, date, author and content from a V2.ai blog post page
+    """
+    soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+
+    # Extract title
+    title_element = soup.find("h1")
+    title = title_element.get_text(strip=True) if title_element else "No title found"
+
+    # Extract author and date - V2.ai specific structure
+    author = "Ashley Rodan"  # Known author for this specific post
+    date = None
+
+    # Search in title area and nearby text
+    if title_element:
+        # Look for date in parent container or siblings
+        container = title_element.parent
+        if container:
+            match = _DATE_RE.search(container.get_text())
+            if match:
+                date = match.group().strip()
+                # Clean up date if it contains author name
+                if "Rodan" in date:
+                    date = _RODAN_RE.sub("", date)
+
+    # Additional selectors for V2.ai structure
+    if not date:
+        for date_element in soup.css.iselect(_DATE_SELECTOR):
+            date_text = date_element.get("datetime") or date_element.get_text(
+                strip=True
+            )
+            if date_text:
+                date = date_text
+                break
+
+    if not date:
+        date = "Date not found"
+
+    # Extract content - remove script, style, nav, header, footer
+    for element in soup(["script", "style", "nav", "header", "footer"]):
+        element.decompose()
+
+    # Look for main content areas
+    content = ""
+    for content_element in soup.css.iselect(_CONTENT_SELECTOR):
+        # Get all paragraph text
+        paragraphs = content_element.find_all("p")
+        if paragraphs:
+            content = _join_paragraphs(paragraphs)
+            break
+
+    # Fallback: get all paragraphs from body
+    if not content:
+        content = _join_paragraphs(soup.find_all("p"))
+
+    if not content:
+        content = "Content not found"
+
+    return {
+        "title": title,
+        "date": date,
+        "author": author,
+        "content": content,
+        "url": url,
+    }
+
+
+def fetch_blog_posts(include_content: bool = True) -> list:
     """
     Fetch blog posts from available sources (V2.ai and/or Contentful)
+
+    Pass include_content=False for metadata-only listings; Contentful then
+    skips downloading post bodies.
     """
     import os
 
@@ -145,7 +184,9 @@ def fetch_blog_posts() -> list:
             from .contentful_client import fetch_contentful_posts
 
             contentful_posts = fetch_contentful_posts(
-                content_type=os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost"), limit=10
+                content_type=os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost"),
+                limit=10,
+                include_content=include_content,
             )
             posts.extend(contentful_posts)
         except Exception as e:
@@ -153,8 +194,6 @@ def fetch_blog_posts() -> list:
 
     # Fallback to V2.ai scraping if no Contentful posts or as additional source
     if not posts:
-        url = "https://www.v2.ai/insights/adopting-AI-assistants-while-balancing-risks"
-        v2ai_post = fetch_blog_post(url)
-        posts.append(v2ai_post)
+        posts.extend(fetch_blog_post_list(list(V2AI_POST_URLS)))
 
     return posts
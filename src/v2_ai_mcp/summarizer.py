@@ -1,32 +1,406 @@
+import functools
+import hashlib
+import logging
 import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
+import orjson
 from openai import OpenAI
 
+# Summarization doesn't need a frontier model; a small one returns the same
+# gist at a fraction of the per-token latency and cost
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Output token cap per summary; generated tokens dominate completion latency,
+# and an 80-word summary fits with room to spare
+MAX_SUMMARY_TOKENS = 160
+
+# Posts packed into one summarize_batch request; keeps N summaries within
+# what the model will reliably return as a single JSON object
+MAX_BATCH_SIZE = 10
+
+# Longest text sent for summarizing, in characters (about 6000 tokens of
+# English); the opening of a post carries its gist, and every input token
+# adds latency and cost
+MAX_INPUT_CHARS = 24_000
+
+# Retries of a rate-limited, timed-out or 5xx completion before giving up;
+# the OpenAI client backs off exponentially with jitter between attempts
+MAX_RETRIES = 4
+
+# Rate limits assumed for whichever of requests or tokens per minute a
+# throttled summarize_many() call leaves unset
+DEFAULT_REQUESTS_PER_MINUTE = 3500
+DEFAULT_TOKENS_PER_MINUTE = 90_000
+
+# Batch API statuses after which a batch will not change any more
+_BATCH_DONE = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Instructions sent ahead of every post. OpenAI caches repeated prompt
+# prefixes server-side, which only hits when the prefix is byte-identical,
+# so these stay fixed strings and the post text always goes last.
+_SYSTEM_PROMPT = "You are a summarizer. Produce a 3-sentence summary (at most 80 words) of the blog post capturing only its top 3 insights. Do not include a preamble."
+_BATCH_SYSTEM_PROMPT = "You are a summarizer. Produce a 3-sentence summary (at most 80 words) of each blog post capturing only its top 3 insights. Do not include a preamble. Reply with a JSON object mapping each post's i value, as a string, to its summary."
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _client(api_key: str | None) -> OpenAI:
+    """
+    Return the OpenAI client for an API key, creating it on first use
+
+    Building a client sets up an SSL context and connection pool; reusing
+    one keeps both warm across summaries. A changed key gets a new client.
+    """
+    return OpenAI(api_key=api_key, max_retries=MAX_RETRIES)
+
+
+def _truncate(text: str) -> str:
+    """Cut text to MAX_INPUT_CHARS, at the last word boundary before the limit"""
+    if len(text) <= MAX_INPUT_CHARS:
+        return text
+    logger.info(
+        "Truncating %d characters of text to %d for summarizing",
+        len(text),
+        MAX_INPUT_CHARS,
+    )
+    head = text[:MAX_INPUT_CHARS]
+    if text[MAX_INPUT_CHARS].isspace():
+        return head
+    # An all-whitespace head has no word boundary to cut back to
+    return (head.rsplit(None, 1) or [head])[0]
+
+
+def summary_request(text: str) -> dict:
+    """Build the chat completion request for summarizing text"""
+    return {
+        "model": os.getenv("OPENAI_MODEL", DEFAULT_MODEL),
+        "messages": [
+            {
+                "role": "system",
+                "content": _SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": f"Please summarize this blog post:\n\n{_truncate(text)}",
+            },
+        ],
+        "max_tokens": MAX_SUMMARY_TOKENS,
+        "temperature": 0.0,
+    }
+
+
+def _log_usage(response) -> None:
+    """Log how many prompt tokens of a response were served from OpenAI's cache"""
+    details = getattr(response.usage, "prompt_tokens_details", None)
+    if details is not None and details.cached_tokens is not None:
+        logger.debug(
+            "Summary used %s prompt tokens, %s cached",
+            response.usage.prompt_tokens,
+            details.cached_tokens,
+        )
+
+
+def summary_key(request: dict) -> bytes:
+    """
+    Return a digest identifying the summary a summary_request() would produce
+
+    The digest covers the whole request, model and prompt included, so
+    cached summaries stop matching when either changes.
+    """
+    body = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+@dataclass(slots=True, frozen=True)
+class Summary:
+    """Result of one summarization request, with its token usage"""
+
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    # Set when the request failed; text then holds the error message
+    error: str | None = None
+
+
+def summarize_result(text: str) -> Summary:
+    """
+    Summarize the given text, returning the summary with its token usage
+
+    Failures come back as a Summary with error set instead of raising.
+    """
+    return summarize_request(summary_request(text))
+
+
+def summarize_request(args: dict) -> Summary:
+    """Send a request built by summary_request(), as summarize_result() does"""
+    try:
+        client = _client(os.getenv("OPENAI_API_KEY"))
+
+        response = client.chat.completions.create(**args)
+        _log_usage(response)
+
+        content = response.choices[0].message.content or "No content returned"
+    except Exception as e:
+        return Summary(
+            text=f"Error generating summary: {str(e)}",
+            model=args["model"],
+            error=str(e),
+        )
+
+    usage = response.usage
+    details = getattr(usage, "prompt_tokens_details", None)
+    return Summary(
+        text=content,
+        model=args["model"],
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+        cached_tokens=(details.cached_tokens or 0) if details else 0,
+    )
+
 
 def summarize(text: str) -> str:
     """
-    Summarize the given text using OpenAI's GPT-4
+    Summarize the given text using an OpenAI chat model
+
+    The model comes from OPENAI_MODEL, defaulting to DEFAULT_MODEL. On
+    failure the returned text is an "Error generating summary:" message;
+    use summarize_result() to tell failures apart without matching it.
+    """
+    return summarize_result(text).text
+
+
+def summarize_stream(text: str) -> Iterator[str]:
+    """
+    Summarize the given text, yielding the summary as it is generated
+
+    The first pieces arrive long before the whole completion would, so a
+    caller can start rendering or forwarding them right away. API errors
+    propagate to the caller instead of becoming an error string.
     """
+    client = _client(os.getenv("OPENAI_API_KEY"))
+
+    stream = client.chat.completions.create(**summary_request(text), stream=True)
+    for chunk in stream:
+        if chunk.choices and (piece := chunk.choices[0].delta.content):
+            yield piece
+
+
+class _Throttle:
+    """
+    Token buckets limiting requests and tokens per minute across threads
+
+    Each bucket refills continuously at its per-minute rate and holds at
+    most one minute's worth, so a burst can't overshoot the account limits.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self._rates = (requests_per_minute / 60, tokens_per_minute / 60)
+        self._capacity = (requests_per_minute, tokens_per_minute)
+        self._available = [float(requests_per_minute), float(tokens_per_minute)]
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        """Block until one request costing tokens fits within both limits"""
+        # A request larger than the per-minute budget could never fit
+        tokens = min(tokens, self._capacity[1])
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed, self._updated = now - self._updated, now
+                for i, rate in enumerate(self._rates):
+                    self._available[i] = min(
+                        self._capacity[i], self._available[i] + elapsed * rate
+                    )
+                wait = max(
+                    (1 - self._available[0]) / self._rates[0],
+                    (tokens - self._available[1]) / self._rates[1],
+                )
+                if wait <= 0:
+                    self._available[0] -= 1
+                    self._available[1] -= tokens
+                    return
+            time.sleep(wait)
+
+
+def _request_tokens(text: str) -> int:
+    """Estimate the tokens a summary request uses, at about 4 characters a token"""
+    return len(_truncate(text)) // 4 + MAX_SUMMARY_TOKENS
+
+
+def summarize_many(
+    texts: list[str],
+    max_workers: int = 10,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+) -> list[str]:
+    """
+    Summarize several texts concurrently, returning summaries in input order
+
+    Each summary is an independent API round trip, so they run on a thread
+    pool sharing one client; max_workers bounds the requests in flight.
+    Pass the account's rate limits to pace large jobs under them instead of
+    bursting into rate-limit errors.
+    """
+    if len(texts) <= 1:
+        return [summarize(text) for text in texts]
+
+    task = summarize
+    if requests_per_minute or tokens_per_minute:
+        throttle = _Throttle(
+            requests_per_minute or DEFAULT_REQUESTS_PER_MINUTE,
+            tokens_per_minute or DEFAULT_TOKENS_PER_MINUTE,
+        )
+
+        def task(text: str) -> str:
+            throttle.acquire(_request_tokens(text))
+            return summarize(text)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+        return list(executor.map(task, texts))
+
+
+def summarize_batch(texts: list[str]) -> list[str]:
+    """
+    Summarize several texts with one chat completion per MAX_BATCH_SIZE texts
+
+    The posts share one system prompt and one round trip, and the model
+    returns the summaries as a JSON object keyed by each post's index.
+    A summary the response doesn't contain comes back as an error string,
+    the same as a failed summarize() call.
+    """
+    summaries = []
+    for start in range(0, len(texts), MAX_BATCH_SIZE):
+        summaries.extend(_summarize_chunk(texts[start : start + MAX_BATCH_SIZE]))
+    return summaries
+
+
+def _summarize_chunk(texts: list[str]) -> list[str]:
+    """Summarize up to MAX_BATCH_SIZE texts in a single request"""
+    posts = "\n\n".join(
+        f"<<POST i={i}>>\n{_truncate(text)}\n<<END>>" for i, text in enumerate(texts)
+    )
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = _client(os.getenv("OPENAI_API_KEY"))
 
         response = client.chat.completions.create(
-            model="gpt-4",
+            model=os.getenv("OPENAI_MODEL", DEFAULT_MODEL),
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a helpful assistant that summarizes blog posts. Provide a concise summary that captures the main points and key insights.",
+                    "content": _BATCH_SYSTEM_PROMPT,
                 },
                 {
                     "role": "user",
-                    "content": f"Please summarize this blog post:\n\n{text}",
+                    "content": f"Please summarize these blog posts:\n\n{posts}",
                 },
             ],
-            max_tokens=500,
-            temperature=0.3,
+            max_tokens=MAX_SUMMARY_TOKENS * len(texts),
+            temperature=0.0,
+            response_format={"type": "json_object"},
         )
 
-        return response.choices[0].message.content or "No content returned"
-
+        _log_usage(response)
+        result = orjson.loads(response.choices[0].message.content or "{}")
     except Exception as e:
-        return f"Error generating summary: {str(e)}"
+        return [f"Error generating summary: {str(e)}"] * len(texts)
+
+    if not isinstance(result, dict):
+        result = {}
+
+    summaries = []
+    for i in range(len(texts)):
+        summary = result.get(str(i))
+        # A nested or non-text answer isn't a summary the caller can use
+        if not isinstance(summary, str) or not summary:
+            summary = "Error generating summary: missing from batch response"
+        summaries.append(summary)
+    return summaries
+
+
+def summarize_bulk(texts: list[str]) -> str:
+    """
+    Submit texts to the OpenAI Batch API for summarization, returning the batch id
+
+    For offline jobs where a summary can take up to a day: batched requests
+    cost half as much and have their own rate limit, so interactive
+    summaries aren't starved. Fetch the results with collect_bulk().
+    """
+    client = _client(os.getenv("OPENAI_API_KEY"))
+
+    requests = b"".join(
+        orjson.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": summary_request(text),
+            }
+        )
+        + b"\n"
+        for i, text in enumerate(texts)
+    )
+    batch_file = client.files.create(
+        file=("summaries.jsonl", requests), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def collect_bulk(batch_id: str, poll_interval: float = 30.0) -> list[str]:
+    """
+    Wait for a summarize_bulk() batch to finish and return its summaries
+
+    Summaries are in the order of the submitted texts; a request that failed
+    within the batch comes back as an error string. Raises RuntimeError if
+    the batch as a whole failed, expired or was cancelled.
+    """
+    client = _client(os.getenv("OPENAI_API_KEY"))
+
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in _BATCH_DONE:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch_id} {batch.status}")
+
+    summaries = {}
+    for output_id in (batch.output_file_id, batch.error_file_id):
+        if not output_id:
+            continue
+        for line in client.files.content(output_id).content.splitlines():
+            result = orjson.loads(line)
+            summaries[int(result["custom_id"])] = _batch_summary(result)
+
+    # request_counts is optional, so size the list to cover every output too
+    counts = batch.request_counts
+    total = max(counts.total if counts else 0, max(summaries, default=-1) + 1)
+    return [
+        summaries.get(i, "Error generating summary: missing from batch output")
+        for i in range(total)
+    ]
+
+
+def _batch_summary(result: dict) -> str:
+    """Return the summary, or an error string, from one Batch API output line"""
+    response = result.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") != 200:
+        error = result.get("error") or body.get("error") or {}
+        return f"Error generating summary: {error.get('message', 'request failed')}"
+    choices = body.get("choices") or [{}]
+    content = (choices[0].get("message") or {}).get("content")
+    return content or "No content returned"
@@ -2,10 +2,21 @@
 """
 Test script to validate Contentful API integration and blog ingestion.
 Run with: uv run python test_api.py
+
+The v2_ai_mcp package must be importable, which uv run takes care of;
+outside uv, install the project first with pip install -e .
+Each test imports what it uses, so skipped checks don't pay for loading
+the OpenAI or Contentful libraries.
 """
 
+import functools
+import io
+import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any
 
 # Load environment variables from .env file
@@ -13,166 +24,257 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-from v2_ai_mcp.contentful_client import (  # noqa: E402
-    ContentfulClient,
-    fetch_contentful_posts,
+@dataclass(slots=True, frozen=True)
+class Config:
+    """Credentials and settings read from the environment"""
+
+    space_id: str | None
+    access_token: str | None
+    openai_key: str | None
+    content_type: str
+
+    @property
+    def has_contentful(self) -> bool:
+        return bool(self.space_id and self.access_token)
+
+
+CFG = Config(
+    space_id=os.getenv("CONTENTFUL_SPACE_ID"),
+    access_token=os.getenv("CONTENTFUL_ACCESS_TOKEN"),
+    openai_key=os.getenv("OPENAI_API_KEY"),
+    content_type=os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost"),
 )
-from v2_ai_mcp.scraper import fetch_blog_post, fetch_blog_posts  # noqa: E402
-from v2_ai_mcp.summarizer import summarize  # noqa: E402
+
+
+@functools.cache
+def _contentful_client():
+    """Return the ContentfulClient shared by every check"""
+    from v2_ai_mcp.contentful_client import ContentfulClient
+
+    return ContentfulClient(CFG.space_id, CFG.access_token)
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Output stream that holds each check thread's output apart
+
+    Checks running concurrently would otherwise interleave their lines; a
+    thread that has started buffering writes to its own buffer instead.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def start_buffering(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (self._stream if buffer is None else buffer).write(text)
+
+    def flush(self) -> None:
+        # A buffering thread's output isn't on the stream yet
+        if getattr(self._local, "buffer", None) is None:
+            self._stream.flush()
+
+    def write_through(self, text: str) -> None:
+        """Write text straight to the underlying stream"""
+        self._stream.write(text)
+        self._stream.flush()
+
+
+_OUTPUT = _ThreadOutput(sys.stdout)
+
+# Progress is reported through logging as bare messages on stdout
+logger = logging.getLogger("v2_ai_mcp.test")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_handler = logging.StreamHandler(_OUTPUT)
+_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_handler)
+
+
+def _run_concurrently(*checks):
+    """
+    Run independent checks at once, printing their output in the given order
+
+    The checks are network-bound, so overlapping them saves their round
+    trips. Returns each check's result in the same order.
+    """
+
+    def run(check):
+        buffer = _OUTPUT.start_buffering()
+        return buffer, check()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(run, check) for check in checks]
+
+    results = []
+    for future in futures:
+        buffer, result = future.result()
+        _OUTPUT.write_through(buffer.getvalue())
+        results.append(result)
+    return results
+
+
+def _contentful_checks():
+    """Test the Contentful connection, then fetching if it connected"""
+    if not test_contentful_connection():
+        return False, []
+    return True, test_fetch_contentful_posts()
 
 
 def test_contentful_connection():
     """Test basic Contentful API connection."""
-    print("🔍 Testing Contentful Connection...")
-
-    space_id = os.getenv("CONTENTFUL_SPACE_ID")
-    access_token = os.getenv("CONTENTFUL_ACCESS_TOKEN")
+    logger.info("🔍 Testing Contentful Connection...")
 
-    if not space_id or not access_token:
-        print("❌ Contentful credentials not found")
-        print(
+    if not CFG.has_contentful:
+        logger.info("❌ Contentful credentials not found")
+        logger.info(
             "   Set CONTENTFUL_SPACE_ID and CONTENTFUL_ACCESS_TOKEN environment variables"
         )
         return False
 
     try:
-        ContentfulClient(space_id, access_token)
-        print(f"✅ Connected to Contentful space: {space_id}")
+        _contentful_client()
+        logger.info(f"✅ Connected to Contentful space: {CFG.space_id}")
         return True
     except Exception as e:
-        print(f"❌ Connection failed: {e}")
+        logger.info(f"❌ Connection failed: {e}")
         return False
 
 
 def test_fetch_contentful_posts():
     """Test fetching blog posts from Contentful."""
-    print("\n📚 Testing Contentful Blog Post Fetching...")
+    logger.info("\n📚 Testing Contentful Blog Post Fetching...")
 
     try:
-        content_type = os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost")
-        posts = fetch_contentful_posts(content_type=content_type, limit=5)
+        from v2_ai_mcp.contentful_client import fetch_contentful_posts
+
+        posts = fetch_contentful_posts(content_type=CFG.content_type, limit=5)
 
-        print(f"✅ Fetched {len(posts)} posts from Contentful")
+        logger.info(f"✅ Fetched {len(posts)} posts from Contentful")
 
         for i, post in enumerate(posts[:3]):  # Show first 3
-            print(f"\n   📝 Post {i+1}:")
-            print(f"      Title: {post.get('title', 'No title')[:60]}...")
-            print(f"      Author: {post.get('author', 'No author')}")
-            print(f"      Date: {post.get('date', 'No date')}")
-            print(f"      Content: {len(post.get('content', ''))} characters")
-            print(f"      ID: {post.get('id', 'No ID')}")
+            logger.info(f"\n   📝 Post {i + 1}:")
+            logger.info(f"      Title: {post.get('title', 'No title')[:60]}...")
+            logger.info(f"      Author: {post.get('author', 'No author')}")
+            logger.info(f"      Date: {post.get('date', 'No date')}")
+            logger.info(f"      Content: {len(post.get('content', ''))} characters")
+            logger.info(f"      ID: {post.get('id', 'No ID')}")
 
         return posts
 
     except Exception as e:
-        print(f"❌ Failed to fetch posts: {e}")
+        logger.info(f"❌ Failed to fetch posts: {e}")
         return []
 
 
 def test_v2ai_fallback():
     """Test V2.ai scraping fallback."""
-    print("\n🌐 Testing V2.ai Scraping Fallback...")
+    logger.info("\n🌐 Testing V2.ai Scraping Fallback...")
 
     try:
+        from v2_ai_mcp.scraper import fetch_blog_post
+
         url = "https://www.v2.ai/insights/adopting-AI-assistants-while-balancing-risks"
         post = fetch_blog_post(url)
 
-        print("✅ Scraped V2.ai post successfully")
-        print(f"   Title: {post.get('title', 'No title')[:60]}...")
-        print(f"   Author: {post.get('author', 'No author')}")
-        print(f"   Date: {post.get('date', 'No date')}")
-        print(f"   Content: {len(post.get('content', ''))} characters")
+        logger.info("✅ Scraped V2.ai post successfully")
+        logger.info(f"   Title: {post.get('title', 'No title')[:60]}...")
+        logger.info(f"   Author: {post.get('author', 'No author')}")
+        logger.info(f"   Date: {post.get('date', 'No date')}")
+        logger.info(f"   Content: {len(post.get('content', ''))} characters")
 
         return post
 
     except Exception as e:
-        print(f"❌ Failed to scrape V2.ai: {e}")
+        logger.info(f"❌ Failed to scrape V2.ai: {e}")
         return {}
 
 
 def test_unified_fetch():
     """Test the unified fetch_blog_posts function."""
-    print("\n🔄 Testing Unified Blog Post Fetching...")
+    logger.info("\n🔄 Testing Unified Blog Post Fetching...")
 
     try:
+        from v2_ai_mcp.scraper import fetch_blog_posts
+
         posts = fetch_blog_posts()
 
-        print(f"✅ Unified fetch returned {len(posts)} posts")
+        logger.info(f"✅ Unified fetch returned {len(posts)} posts")
 
         # Determine source
-        has_contentful = os.getenv("CONTENTFUL_SPACE_ID") and os.getenv(
-            "CONTENTFUL_ACCESS_TOKEN"
+        source = (
+            "Contentful" if CFG.has_contentful and len(posts) > 1 else "V2.ai scraping"
         )
-        source = "Contentful" if has_contentful and len(posts) > 1 else "V2.ai scraping"
-        print(f"   Source: {source}")
+        logger.info(f"   Source: {source}")
 
         for i, post in enumerate(posts[:2]):  # Show first 2
-            print(f"\n   📄 Post {i+1}:")
-            print(f"      Title: {post.get('title', 'No title')[:50]}...")
-            print(f"      Author: {post.get('author', 'No author')}")
-            print(f"      Date: {post.get('date', 'No date')}")
+            logger.info(f"\n   📄 Post {i + 1}:")
+            logger.info(f"      Title: {post.get('title', 'No title')[:50]}...")
+            logger.info(f"      Author: {post.get('author', 'No author')}")
+            logger.info(f"      Date: {post.get('date', 'No date')}")
 
         return posts
 
     except Exception as e:
-        print(f"❌ Unified fetch failed: {e}")
+        logger.info(f"❌ Unified fetch failed: {e}")
         return []
 
 
 def test_summarization(posts: list[dict[str, Any]]):
     """Test AI summarization on fetched posts."""
-    print("\n🤖 Testing AI Summarization...")
+    logger.info("\n🤖 Testing AI Summarization...")
 
     if not posts:
-        print("❌ No posts available for summarization")
+        logger.info("❌ No posts available for summarization")
         return
 
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if not openai_key:
-        print("❌ OpenAI API key not found")
-        print("   Set OPENAI_API_KEY environment variable")
+    if not CFG.openai_key:
+        logger.info("❌ OpenAI API key not found")
+        logger.info("   Set OPENAI_API_KEY environment variable")
         return
 
     try:
-        post = posts[0]  # Test with first post
-        content = post.get("content", "")
+        from v2_ai_mcp.summarizer import summarize_many
+
+        contents = [
+            post.get("content", "")
+            for post in posts[:3]  # Test with the first few posts
+            if post.get("content") and post.get("content") != "No content"
+        ]
 
-        if not content or content == "No content":
-            print("❌ No content available for summarization")
+        if not contents:
+            logger.info("❌ No content available for summarization")
             return
 
-        # Use first 1000 characters for testing
-        test_content = content[:1000]
-        summary = summarize(test_content)
+        # Use first 1000 characters of each post, summarized concurrently
+        test_contents = [content[:1000] for content in contents]
+        summaries = summarize_many(test_contents)
 
-        print("✅ Generated summary successfully")
-        print(f"   Original: {len(content)} characters")
-        print(f"   Test chunk: {len(test_content)} characters")
-        print(f"   Summary: {summary[:200]}...")
+        logger.info(f"✅ Generated {len(summaries)} summaries successfully")
+        for content, summary in zip(contents, summaries, strict=True):
+            logger.info(f"   Original: {len(content)} characters")
+            logger.info(f"   Summary: {summary[:200]}...")
 
     except Exception as e:
-        print(f"❌ Summarization failed: {e}")
+        logger.info(f"❌ Summarization failed: {e}")
 
 
 def test_contentful_search():
     """Test Contentful search functionality."""
-    print("\n🔍 Testing Contentful Search...")
+    logger.info("\n🔍 Testing Contentful Search...")
 
     try:
-        from v2_ai_mcp.contentful_client import ContentfulClient
-
-        space_id = os.getenv("CONTENTFUL_SPACE_ID")
-        access_token = os.getenv("CONTENTFUL_ACCESS_TOKEN")
-
-        if not space_id or not access_token:
-            print("❌ Contentful credentials not found for search test")
+        if not CFG.has_contentful:
+            logger.info("❌ Contentful credentials not found for search test")
             return
 
-        client = ContentfulClient(space_id, access_token)
-        content_type = os.getenv("CONTENTFUL_CONTENT_TYPE", "blogPost")
+        client = _contentful_client()
 
         # Test search queries
         search_queries = ["AI", "automation", "security", "risk"]
@@ -180,105 +282,100 @@ def test_contentful_search():
         for query in search_queries:
             try:
                 results = client.search_blog_posts(
-                    query, content_type=content_type, limit=3
+                    query, content_type=CFG.content_type, limit=3
                 )
-                print(f"✅ Search '{query}': {len(results)} results")
+                logger.info(f"✅ Search '{query}': {len(results)} results")
 
                 for i, post in enumerate(results[:2]):  # Show first 2 results
-                    print(
-                        f"   📄 Result {i+1}: {post.get('title', 'No title')[:50]}..."
+                    logger.info(
+                        f"   📄 Result {i + 1}: {post.get('title', 'No title')[:50]}..."
                     )
 
             except Exception as e:
-                print(f"❌ Search '{query}' failed: {e}")
+                logger.info(f"❌ Search '{query}' failed: {e}")
 
     except Exception as e:
-        print(f"❌ Search test failed: {e}")
+        logger.info(f"❌ Search test failed: {e}")
 
 
 def test_mcp_tools_simulation():
     """Simulate MCP tool calls."""
-    print("\n🛠️  Testing MCP Tools Simulation...")
+    logger.info("\n🛠️  Testing MCP Tools Simulation...")
 
     try:
+        from v2_ai_mcp.scraper import fetch_blog_posts
+
         # Simulate get_latest_posts()
         posts = fetch_blog_posts()
-        print(f"✅ get_latest_posts(): {len(posts)} posts")
+        logger.info(f"✅ get_latest_posts(): {len(posts)} posts")
 
         # Simulate get_post_content(0)
         if posts:
             post_content = posts[0]
-            print(
+            logger.info(
                 f"✅ get_post_content(0): {post_content.get('title', 'No title')[:40]}..."
             )
 
         # Simulate summarize_post(0)
-        if posts and os.getenv("OPENAI_API_KEY"):
+        if posts and CFG.openai_key:
             try:
+                from v2_ai_mcp.summarizer import summarize
+
                 content = posts[0].get("content", "")[:500]  # Short test
                 summarize(content)
-                print("✅ summarize_post(0): Generated summary")
+                logger.info("✅ summarize_post(0): Generated summary")
             except Exception as e:
-                print(f"⚠️  summarize_post(0): {e}")
+                logger.info(f"⚠️  summarize_post(0): {e}")
 
         # Simulate search_blogs()
-        if os.getenv("CONTENTFUL_SPACE_ID") and os.getenv("CONTENTFUL_ACCESS_TOKEN"):
+        if CFG.has_contentful:
             try:
-                from v2_ai_mcp.contentful_client import ContentfulClient
-
-                client = ContentfulClient()
-                search_results = client.search_blog_posts("AI", limit=2)
-                print(f"✅ search_blogs('AI'): {len(search_results)} results")
+                search_results = _contentful_client().search_blog_posts(
+                    "AI", content_type=CFG.content_type, limit=2
+                )
+                logger.info(f"✅ search_blogs('AI'): {len(search_results)} results")
             except Exception as e:
-                print(f"⚠️  search_blogs('AI'): {e}")
+                logger.info(f"⚠️  search_blogs('AI'): {e}")
 
     except Exception as e:
-        print(f"❌ MCP tools simulation failed: {e}")
+        logger.info(f"❌ MCP tools simulation failed: {e}")
 
 
 def main():
     """Run all tests."""
-    print("🚀 Starting API Validation Tests\n")
-    print("=" * 50)
-
-    # Test Contentful connection
-    contentful_works = test_contentful_connection()
-
-    # Test Contentful fetching
-    contentful_posts = []
-    if contentful_works:
-        contentful_posts = test_fetch_contentful_posts()
+    logger.info("🚀 Starting API Validation Tests\n")
+    logger.info("=" * 50)
 
-    # Test V2.ai fallback
-    v2ai_post = test_v2ai_fallback()
-
-    # Test unified fetching
-    unified_posts = test_unified_fetch()
+    # Test Contentful, the V2.ai fallback and unified fetching, which are
+    # independent of each other
+    (contentful_works, contentful_posts), v2ai_post, unified_posts = _run_concurrently(
+        _contentful_checks, test_v2ai_fallback, test_unified_fetch
+    )
 
-    # Test summarization
+    # Test summarization on the posts fetched above, alongside search and
+    # the MCP tools
     test_posts = (
         contentful_posts if contentful_posts else ([v2ai_post] if v2ai_post else [])
     )
+    second_stage = [test_mcp_tools_simulation]
     if test_posts:
-        test_summarization(test_posts)
-
-    # Test search functionality
+        second_stage.insert(0, functools.partial(test_summarization, test_posts))
     if contentful_works:
-        test_contentful_search()
+        second_stage.insert(-1, test_contentful_search)
+    _run_concurrently(*second_stage)
 
-    # Test MCP tools
-    test_mcp_tools_simulation()
-
-    print("\n" + "=" * 50)
-    print("🏁 Tests Complete!")
+    logger.info("\n" + "=" * 50)
+    logger.info("🏁 Tests Complete!")
 
     # Summary
-    print("\n📊 Summary:")
-    print(f"   Contentful: {'✅ Working' if contentful_works else '❌ Not configured'}")
-    print(f"   V2.ai Scraping: {'✅ Working' if v2ai_post else '❌ Failed'}")
-    print(f"   Unified Fetch: {'✅ Working' if unified_posts else '❌ Failed'}")
-    print(
-        f"   OpenAI API: {'✅ Configured' if os.getenv('OPENAI_API_KEY') else '❌ Not configured'}"
+    logger.info("\n📊 Summary:")
+    logger.info(
+        f"   Contentful: {'✅ Working' if contentful_works else '❌ Not configured'}"
+    )
+    logger.info(f"   V2.ai Scraping: {'✅ Working' if v2ai_post else '❌ Failed'}")
+    logger.info(f"   Unified Fetch: {'✅ Working' if unified_posts else '❌ Failed'}")
+    logger.info(
+        f"   OpenAI API: {'✅ Configured' if CFG.openai_key else '❌ Not configured'}"
     )
 
 
@@ -1,19 +1,144 @@
 """Unit tests for the contentful_client module."""
 
-import os
-from unittest.mock import Mock, patch
+import inspect
+from unittest.mock import Mock, create_autospec, patch
 
+import contentful
+import orjson
 import pytest
+from contentful.resource_builder import ResourceBuilder
 
+from src.v2_ai_mcp import contentful_client
 from src.v2_ai_mcp.contentful_client import (
     ContentfulClient,
+    _entries_query,
     fetch_contentful_posts,
 )
 
 
+def _sys(entry_id, content_type):
+    """Build the sys block of a CDA entry."""
+
+    def link(link_type, link_id):
+        return {"sys": {"type": "Link", "linkType": link_type, "id": link_id}}
+
+    return {
+        "id": entry_id,
+        "type": "Entry",
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "locale": "en-US",
+        "revision": 1,
+        "space": link("Space", "space"),
+        "environment": link("Environment", "master"),
+        "contentType": link("ContentType", content_type),
+    }
+
+
+# The real SDK client class, captured before tests patch contentful.Client,
+# and the configuration its constructor stores on every instance
+_SDK_CLIENT = contentful.Client
+_SDK_DEFAULTS = {
+    name: param.default
+    for name, param in inspect.signature(_SDK_CLIENT).parameters.items()
+    if param.default is not param.empty
+}
+
+
+def _sdk_client():
+    """Build a mock contentful.Client that rejects calls the SDK doesn't support."""
+    client = create_autospec(_SDK_CLIENT, instance=True)
+    client.configure_mock(**_SDK_DEFAULTS)
+    return client
+
+
+def _entry(fields, sys_=None):
+    """Build a mock SDK entry with the given fields and sys block."""
+    entry = Mock()
+    entry.fields.return_value = fields
+    entry.sys = {} if sys_ is None else sys_
+    return entry
+
+
+def _rich_text(*paragraphs):
+    """Build a mock rich text object with one text node per paragraph."""
+    return Mock(content=[Mock(content=[Mock(value=text)]) for text in paragraphs])
+
+
+# Extraction only reads the tree, so one instance serves every test.
+_TWO_PARAGRAPHS = _rich_text("First paragraph", "Second paragraph")
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_client():
+    """Ensure no test reuses a shared client built by another."""
+    contentful_client._shared_client.cache_clear()
+    yield
+    contentful_client._shared_client.cache_clear()
+
+
+@pytest.fixture
+def mock_client_class():
+    """Patch contentful.Client to hand out an autospecced SDK client."""
+    with patch(
+        "src.v2_ai_mcp.contentful_client.contentful.Client",
+        return_value=_sdk_client(),
+    ) as mock_client_class:
+        yield mock_client_class
+
+
+@pytest.fixture(scope="module")
+def client():
+    """A ContentfulClient shared by tests of its entry extraction helpers.
+
+    The helpers never reach the SDK or the HTTP session, so ``__init__`` is
+    bypassed and only the plain attributes are set.
+    """
+    client = ContentfulClient.__new__(ContentfulClient)
+    client.space_id = "space"
+    client.access_token = "token"
+    client.environment = "master"
+    client.client = Mock()
+    return client
+
+
 class TestContentfulClient:
     """Test cases for ContentfulClient class."""
 
+    @pytest.mark.parametrize(
+        ("name", "params"),
+        [
+            ("_get", ["self", "url", "query"]),
+            ("_normalize_query", ["self", "query"]),
+            ("_has_proxy", ["self"]),
+            ("_proxy_parameters", ["self"]),
+            ("_url", ["self", "url"]),
+            ("_request_headers", ["self"]),
+        ],
+    )
+    def test_sdk_internals_are_unchanged(self, name, params):
+        """Test the private SDK methods ContentfulClient._get relies on still match."""
+        method = getattr(_SDK_CLIENT, name, None)
+
+        assert method is not None, f"contentful.Client.{name} no longer exists"
+        assert list(inspect.signature(method).parameters) == params
+
+    def test_sdk_resource_builder_is_unchanged(self):
+        """Test ResourceBuilder and the client attributes _get reads still exist."""
+        params = inspect.signature(ResourceBuilder).parameters
+
+        assert list(params)[:3] == ["default_locale", "localized", "json"]
+        assert {"max_depth", "reuse_entries"} <= params.keys()
+        assert {
+            "raw_mode",
+            "raise_errors",
+            "default_locale",
+            "max_include_resolution_depth",
+            "reuse_entries",
+            "authorization_as_header",
+            "timeout_s",
+        } <= _SDK_DEFAULTS.keys()
+
     def test_init_with_params(self):
         """Test initialization with provided parameters."""
         with patch("src.v2_ai_mcp.contentful_client.contentful.Client") as mock_client:
@@ -28,67 +153,189 @@ class TestContentfulClient:
                 environment="staging",
             )
 
-    def test_init_with_env_vars(self):
+    def test_init_with_env_vars(self, monkeypatch):
         """Test initialization with environment variables."""
+        monkeypatch.setenv("CONTENTFUL_SPACE_ID", "env_space")
+        monkeypatch.setenv("CONTENTFUL_ACCESS_TOKEN", "env_token")
+
         with patch("src.v2_ai_mcp.contentful_client.contentful.Client") as mock_client:
-            with patch.dict(
-                os.environ,
-                {
-                    "CONTENTFUL_SPACE_ID": "env_space",
-                    "CONTENTFUL_ACCESS_TOKEN": "env_token",
-                },
-            ):
-                client = ContentfulClient()
-
-                assert client.space_id == "env_space"
-                assert client.access_token == "env_token"
-                assert client.environment == "master"
-                mock_client.assert_called_once_with(
-                    space_id="env_space",
-                    access_token="env_token",
-                    environment="master",
-                )
-
-    def test_init_missing_credentials(self):
-        """Test initialization fails with missing credentials."""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(
-                ValueError, match="space_id and access_token are required"
-            ):
-                ContentfulClient()
-
-    def test_init_missing_space_id(self):
-        """Test initialization fails with missing space ID."""
-        with patch.dict(os.environ, {"CONTENTFUL_ACCESS_TOKEN": "token"}, clear=True):
-            with pytest.raises(
-                ValueError, match="space_id and access_token are required"
-            ):
-                ContentfulClient()
-
-    def test_init_missing_access_token(self):
-        """Test initialization fails with missing access token."""
-        with patch.dict(os.environ, {"CONTENTFUL_SPACE_ID": "space"}, clear=True):
-            with pytest.raises(
-                ValueError, match="space_id and access_token are required"
-            ):
-                ContentfulClient()
-
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
+            client = ContentfulClient()
+
+            assert client.space_id == "env_space"
+            assert client.access_token == "env_token"
+            assert client.environment == "master"
+            mock_client.assert_called_once_with(
+                space_id="env_space",
+                access_token="env_token",
+                environment="master",
+            )
+
+    @pytest.mark.parametrize(
+        "env",
+        [
+            {},
+            {"CONTENTFUL_ACCESS_TOKEN": "token"},
+            {"CONTENTFUL_SPACE_ID": "space"},
+        ],
+        ids=["no_credentials", "no_space_id", "no_access_token"],
+    )
+    def test_init_missing_credentials(self, monkeypatch, env):
+        """Test initialization fails unless both credentials are set."""
+        monkeypatch.delenv("CONTENTFUL_SPACE_ID", raising=False)
+        monkeypatch.delenv("CONTENTFUL_ACCESS_TOKEN", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+
+        with pytest.raises(ValueError, match="space_id and access_token are required"):
+            ContentfulClient()
+
+    def test_http_get_uses_shared_session(self, mock_client_class):
+        """Test SDK requests are routed through one keep-alive session."""
+        mock_client = mock_client_class.return_value
+        mock_client.authorization_as_header = True
+        mock_client.timeout_s = 1
+        mock_client._has_proxy.return_value = None
+        mock_client._request_headers.return_value = {"Authorization": "Bearer t"}
+        mock_client._url.side_effect = lambda url: f"https://cdn.example.com{url}"
+
+        client = ContentfulClient("space", "token")
+
+        with patch.object(client._session, "get") as mock_get:
+            mock_get.return_value = Mock(status_code=200)
+
+            client._http_get("/entries", {"limit": 1})
+            client._http_get("/entries", {"limit": 2})
+
+            assert mock_get.call_count == 2
+            mock_client._request_headers.assert_called_once()
+            mock_get.assert_called_with(
+                "https://cdn.example.com/entries",
+                params={"limit": 2},
+                headers={"Authorization": "Bearer t"},
+                timeout=1,
+            )
+
+    @patch("src.v2_ai_mcp.contentful_client.ResourceBuilder")
+    def test_get_parses_response_with_orjson(
+        self, mock_builder_class, mock_client_class
+    ):
+        """Test SDK responses are parsed with orjson and built into resources."""
+        mock_client = mock_client_class.return_value
+        mock_client.raw_mode = False
+        mock_client.max_rate_limit_retries = 1
+
+        client = ContentfulClient("space", "token")
+        assert mock_client._get == client._get
+
+        response = Mock(status_code=200, content=b'{"items": []}', headers={})
+        with patch.object(client, "_http_get", return_value=response):
+            result = client._get("/entries", {"limit": 1})
+
+        assert mock_builder_class.call_args[0][2] == {"items": []}
+        assert result == mock_builder_class.return_value.build.return_value
+
+    @patch("src.v2_ai_mcp.contentful_client.ResourceBuilder")
+    def test_get_revalidates_with_etag(self, mock_builder_class, mock_client_class):
+        """Test repeated requests send If-None-Match and reuse results on 304."""
+        mock_client = mock_client_class.return_value
+        mock_client.raw_mode = False
+        mock_client.max_rate_limit_retries = 1
+        mock_client._has_proxy.return_value = None
+        mock_client._request_headers.side_effect = lambda: {}
+
+        client = ContentfulClient("space", "token")
+        fresh = Mock(status_code=200, content=b"{}", headers={"ETag": '"v1"'})
+        not_modified = Mock(status_code=304, content=b"", headers={})
+
+        with patch.object(client._session, "get") as mock_get:
+            mock_get.side_effect = [fresh, not_modified]
+
+            first = client._get("/entries", {"limit": 1})
+            second = client._get("/entries", {"limit": 1})
+
+        assert "If-None-Match" not in mock_get.call_args_list[0][1]["headers"]
+        assert mock_get.call_args_list[1][1]["headers"]["If-None-Match"] == '"v1"'
+        assert second is first
+        mock_builder_class.assert_called_once()
+
+    @patch("src.v2_ai_mcp.contentful_client.get_error")
+    def test_get_raises_api_errors(self, mock_get_error, mock_client_class):
+        """Test non-200 responses raise the SDK's error type."""
+        mock_client = mock_client_class.return_value
+        mock_client.raw_mode = False
+        mock_client.raise_errors = True
+        mock_client.max_rate_limit_retries = 1
+        mock_get_error.return_value = RuntimeError("Not found")
+
+        client = ContentfulClient("space", "token")
+
+        with patch.object(client, "_http_get", return_value=Mock(status_code=404)):
+            with pytest.raises(RuntimeError, match="Not found"):
+                client._get("/entries")
+
+    def test_http_get_advertises_decodable_encodings(self, mock_client_class):
+        """Test compressed responses are requested in every supported encoding."""
+        from urllib3.util.request import ACCEPT_ENCODING
+
+        mock_client = mock_client_class.return_value
+        mock_client._has_proxy.return_value = None
+        mock_client._request_headers.return_value = {"Accept-Encoding": "gzip"}
+
+        client = ContentfulClient("space", "token")
+
+        with patch.object(client._session, "get") as mock_get:
+            mock_get.return_value = Mock(status_code=200)
+            client._http_get("/entries", {})
+
+        headers = mock_get.call_args.kwargs["headers"]
+        assert headers["Accept-Encoding"] == ACCEPT_ENCODING
+        assert "gzip" in headers["Accept-Encoding"]
+
+    def test_http_get_rate_limited(self, mock_client_class):
+        """Test a 429 response raises the SDK's rate limit error for retry."""
+        from contentful.errors import RateLimitExceededError
+
+        mock_client = mock_client_class.return_value
+        mock_client._has_proxy.return_value = None
+        mock_client._request_headers.return_value = {}
+
+        client = ContentfulClient("space", "token")
+
+        with patch.object(client._session, "get") as mock_get:
+            mock_get.return_value = Mock(status_code=429, headers={})
+
+            with pytest.raises(RateLimitExceededError):
+                client._http_get("/entries", {})
+
+    @patch("src.v2_ai_mcp.contentful_client._build_session")
+    def test_context_manager_closes_session(
+        self, mock_build_session, mock_client_class
+    ):
+        """Test leaving the context manager closes the HTTP session."""
+        mock_session = Mock()
+        mock_build_session.return_value = mock_session
+
+        with ContentfulClient("space", "token") as client:
+            assert client._session is mock_session
+            mock_session.close.assert_not_called()
+
+        mock_session.close.assert_called_once()
+
     def test_fetch_blog_posts_success(self, mock_client_class):
         """Test successful blog posts fetching."""
         # Mock Contentful client and entries
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_client = mock_client_class.return_value
 
         # Create mock entry
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "Test Blog Post",
-            "content": "Test content",
-            "author": "Test Author",
-            "slug": "test-post",
-        }
-        mock_entry.sys = {"id": "test123", "createdAt": "2024-01-01T00:00:00Z"}
+        mock_entry = _entry(
+            {
+                "title": "Test Blog Post",
+                "content": "Test content",
+                "author": "Test Author",
+                "slug": "test-post",
+            },
+            {"id": "test123", "createdAt": "2024-01-01T00:00:00Z"},
+        )
 
         mock_client.entries.return_value = [mock_entry]
 
@@ -111,33 +358,118 @@ class TestContentfulClient:
         assert posts[0]["content"] == "Test content"
         assert posts[0]["id"] == "test123"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_fetch_blog_posts_error(self, mock_client_class):
-        """Test blog posts fetching with error."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        mock_client.entries.side_effect = Exception("API Error")
+    @patch("src.v2_ai_mcp.contentful_client.ContentTypeCache")
+    def test_fetch_blog_posts_without_content(self, mock_cache, mock_client_class):
+        """Test metadata-only listings select every field except the body."""
+        mock_client = mock_client_class.return_value
+        mock_client.entries.return_value = []
+        model = Mock()
+        model.fields = [Mock(id="title"), Mock(id="content"), Mock(id="author")]
+        mock_cache.get.return_value = model
 
         client = ContentfulClient("space", "token")
-        posts = client.fetch_blog_posts()
+        client.fetch_blog_posts("blogPost", 5, include_content=False)
 
-        # Should return error post
-        assert len(posts) == 1
-        assert posts[0]["title"] == "Error fetching from Contentful"
-        assert "API Error" in posts[0]["content"]
+        mock_cache.get.assert_called_once_with("space", "blogPost")
+        sent = mock_client.entries.call_args[0][0]
+        assert sent["select"] == "sys,fields.title,fields.author"
+
+    @patch("src.v2_ai_mcp.contentful_client.ContentTypeCache")
+    def test_fetch_blog_posts_without_content_unknown_model(
+        self, mock_cache, mock_client_class
+    ):
+        """Test listings select everything when the content model is unknown."""
+        mock_client = mock_client_class.return_value
+        mock_client.entries.return_value = []
+        mock_cache.get.return_value = None
+
+        client = ContentfulClient("space", "token")
+        client.fetch_blog_posts("blogPost", 5, include_content=False)
+
+        assert "select" not in mock_client.entries.call_args[0][0]
+
+    @patch("src.v2_ai_mcp.contentful_client.ContentTypeCache")
+    def test_fetch_blog_posts_without_content_skips_rich_text(
+        self, mock_cache, mock_client_class
+    ):
+        """Test metadata-only listings never walk a downloaded body."""
+        mock_client = mock_client_class.return_value
+        mock_cache.get.return_value = None
+        mock_entry = _entry(
+            {
+                "title": "Test Post",
+                "content": {"nodeType": "document", "content": []},
+            },
+            {"id": "test123", "createdAt": "2024-01-01T00:00:00Z"},
+        )
+        mock_client.entries.return_value = [mock_entry]
+
+        client = ContentfulClient("space", "token")
+        with patch.object(client, "_extract_rich_text") as mock_walk:
+            posts = client.fetch_blog_posts("blogPost", 5, include_content=False)
+
+        mock_walk.assert_not_called()
+        assert posts[0]["title"] == "Test Post"
+        assert posts[0]["content"] == ""
+
+    def test_fetch_blog_posts_resolves_linked_author_in_one_request(self):
+        """Test linked authors come from the response includes, not extra calls."""
+        payload = {
+            "sys": {"type": "Array"},
+            "total": 1,
+            "skip": 0,
+            "limit": 10,
+            "items": [
+                {
+                    "sys": _sys("post1", "blogPost"),
+                    "fields": {
+                        "title": "Linked Post",
+                        "author": {
+                            "sys": {
+                                "type": "Link",
+                                "linkType": "Entry",
+                                "id": "author1",
+                            }
+                        },
+                    },
+                }
+            ],
+            "includes": {
+                "Entry": [
+                    {"sys": _sys("author1", "author"), "fields": {"name": "Jane"}}
+                ]
+            },
+        }
+        real_client = contentful.Client
+
+        with patch(
+            "src.v2_ai_mcp.contentful_client.contentful.Client",
+            side_effect=lambda **kw: real_client(content_type_cache=False, **kw),
+        ):
+            client = ContentfulClient("space", "token")
+
+        with patch.object(client._session, "get") as mock_get:
+            mock_get.return_value = Mock(
+                status_code=200, content=orjson.dumps(payload), headers={}
+            )
+            posts = client.fetch_blog_posts()
+
+        assert mock_get.call_count == 1
+        assert posts[0]["title"] == "Linked Post"
+        assert posts[0]["author"] == "Jane"
+        assert posts[0]["date"].startswith("2024-01-01T00:00:00")
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
     def test_fetch_single_post_success(self, mock_client_class):
         """Test successful single post fetching."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_client = mock_client_class.return_value
 
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "Single Post",
-            "content": "Single content",
-        }
-        mock_entry.sys = {"id": "single123"}
+        mock_entry = _entry(
+            {
+                "title": "Single Post",
+                "content": "Single content",
+            },
+            {"id": "single123"},
+        )
 
         mock_client.entry.return_value = mock_entry
 
@@ -148,32 +480,65 @@ class TestContentfulClient:
         assert post["title"] == "Single Post"
         assert post["id"] == "single123"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_fetch_single_post_error(self, mock_client_class):
-        """Test single post fetching with error."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        mock_client.entry.side_effect = Exception("Entry not found")
+    def test_fetch_many_single_request(self, mock_client_class):
+        """Test fetching several posts by ID uses one request and keeps order."""
+        mock_client = mock_client_class.return_value
+
+        entries = []
+        for entry_id in ("b", "a"):
+            mock_entry = _entry({"title": f"Post {entry_id}"}, {"id": entry_id})
+            entries.append(mock_entry)
+        mock_client.entries.return_value = entries
+
+        client = ContentfulClient("space", "token")
+        posts = client.fetch_many(["a", "missing", "b"])
+
+        mock_client.entries.assert_called_once_with(
+            {"sys.id[in]": ["a", "missing", "b"], "limit": 3}
+        )
+        assert [post["id"] for post in posts] == ["a", "b"]
+
+    def test_fetch_many_batches_long_id_lists(self, mock_client_class):
+        """Test long ID lists are split into requests of at most a batch each."""
+        mock_client = mock_client_class.return_value
+        mock_client.entries.side_effect = lambda query: [
+            _entry({"title": f"Post {i}"}, {"id": i}) for i in query["sys.id[in]"]
+        ]
+        ids = [f"id{i}" for i in range(5)]
+
+        client = ContentfulClient("space", "token")
+        with patch("src.v2_ai_mcp.contentful_client.FETCH_MANY_BATCH_SIZE", 2):
+            posts = client.fetch_many(ids)
+
+        assert [
+            c.args[0]["sys.id[in]"] for c in mock_client.entries.call_args_list
+        ] == [
+            ["id0", "id1"],
+            ["id2", "id3"],
+            ["id4"],
+        ]
+        assert [post["id"] for post in posts] == ids
+
+    def test_fetch_many_empty(self, mock_client_class):
+        """Test fetching no IDs skips the request entirely."""
+        mock_client = mock_client_class.return_value
 
         client = ContentfulClient("space", "token")
-        post = client.fetch_single_post("invalid123")
 
-        assert post["title"] == "Error fetching post"
-        assert "Entry not found" in post["content"]
-        assert post["id"] == "invalid123"
+        assert client.fetch_many([]) == []
+        mock_client.entries.assert_not_called()
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
     def test_search_blog_posts_success(self, mock_client_class):
         """Test successful blog posts search."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_client = mock_client_class.return_value
 
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "AI Blog Post",
-            "content": "Content about artificial intelligence",
-        }
-        mock_entry.sys = {"id": "ai123"}
+        mock_entry = _entry(
+            {
+                "title": "AI Blog Post",
+                "content": "Content about artificial intelligence",
+            },
+            {"id": "ai123"},
+        )
 
         mock_client.entries.return_value = [mock_entry]
 
@@ -192,41 +557,83 @@ class TestContentfulClient:
         assert len(posts) == 1
         assert posts[0]["title"] == "AI Blog Post"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_search_blog_posts_error(self, mock_client_class):
-        """Test blog posts search with error."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        mock_client.entries.side_effect = Exception("Search failed")
+    def test_search_blog_posts_passes_query_as_parameter(self, mock_client_class):
+        """Test search text is sent verbatim as a parameter, never interpolated."""
+        mock_client = mock_client_class.return_value
+        mock_client.entries.return_value = []
 
         client = ContentfulClient("space", "token")
-        posts = client.search_blog_posts("test query")
+        query = 'AI" } limit: 1000 { "'
+        client.search_blog_posts(query)
 
-        assert len(posts) == 1
-        assert "Error searching Contentful for 'test query'" in posts[0]["title"]
-        assert "Search failed" in posts[0]["content"]
+        sent = mock_client.entries.call_args[0][0]
+        assert sent["query"] == query
+        assert sent["limit"] == 10
 
+    def test_search_blog_posts_filters_by_date_server_side(self, mock_client_class):
+        """Test date bounds are sent to Contentful as query filters."""
+        mock_client = mock_client_class.return_value
+        mock_client.entries.return_value = []
 
-class TestContentExtractionMethods:
-    """Test cases for content extraction methods."""
+        client = ContentfulClient("space", "token")
+        client.search_blog_posts(
+            "AI", created_after="2024-01-01", created_before="2024-12-31"
+        )
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_complete(self, mock_client_class):
-        """Test post data extraction with complete data."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        sent = mock_client.entries.call_args[0][0]
+        assert sent["sys.createdAt[gte]"] == "2024-01-01"
+        assert sent["sys.createdAt[lte]"] == "2024-12-31"
+        assert sent["query"] == "AI"
+
+    @pytest.mark.parametrize(
+        ("method", "args", "title", "entry_id"),
+        [
+            ("fetch_blog_posts", (), "Error fetching from Contentful", ""),
+            ("fetch_single_post", ("invalid123",), "Error fetching post", "invalid123"),
+            ("fetch_many", (["a"],), "Error fetching posts", ""),
+            (
+                "search_blog_posts",
+                ("test query",),
+                "Error searching Contentful for 'test query'",
+                "",
+            ),
+        ],
+    )
+    def test_api_error_returns_error_post(
+        self, mock_client_class, method, args, title, entry_id
+    ):
+        """Test SDK errors come back as an error post instead of raising."""
+        mock_client = mock_client_class.return_value
+        mock_client.entries.side_effect = Exception("API Error")
+        mock_client.entry.side_effect = Exception("API Error")
 
         client = ContentfulClient("space", "token")
+        result = getattr(client, method)(*args)
+
+        # fetch_single_post returns one post, the others a list of them.
+        if isinstance(result, list):
+            assert len(result) == 1
+            result = result[0]
+        assert result["title"] == title
+        assert "API Error" in result["content"]
+        assert result["id"] == entry_id
+
 
+class TestContentExtractionMethods:
+    """Test cases for content extraction methods."""
+
+    def test_extract_post_data_complete(self, client):
+        """Test post data extraction with complete data."""
         # Create mock entry with complete data
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "Complete Post",
-            "content": "Full content here",
-            "author": "John Doe",
-            "slug": "complete-post",
-        }
-        mock_entry.sys = {"id": "complete123", "createdAt": "2024-01-01"}
+        mock_entry = _entry(
+            {
+                "title": "Complete Post",
+                "content": "Full content here",
+                "author": "John Doe",
+                "slug": "complete-post",
+            },
+            {"id": "complete123", "createdAt": "2024-01-01"},
+        )
 
         result = client._extract_post_data(mock_entry)
 
@@ -236,17 +643,9 @@ class TestContentExtractionMethods:
         assert result["url"] == "https://your-site.com/complete-post"
         assert result["id"] == "complete123"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_minimal(self, mock_client_class):
+    def test_extract_post_data_minimal(self, client):
         """Test post data extraction with minimal data."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {}
-        mock_entry.sys = {}
+        mock_entry = _entry({}, {})
 
         result = client._extract_post_data(mock_entry)
 
@@ -255,14 +654,8 @@ class TestContentExtractionMethods:
         assert result["author"] == "Unknown Author"
         assert result["url"] == ""
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_error(self, mock_client_class):
+    def test_extract_post_data_error(self, client):
         """Test post data extraction with error."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         mock_entry = Mock()
         mock_entry.fields.side_effect = Exception("Field access error")
 
@@ -271,73 +664,22 @@ class TestContentExtractionMethods:
 
         assert result is None
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_linked_entry(self, mock_client_class):
-        """Test author extraction from linked entry."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        # Mock linked author entry
-        mock_author = Mock()
-        mock_author.fields.return_value = {"name": "Jane Smith"}
-
-        fields = {"author": mock_author}
-        result = client._extract_author(fields)
-
-        assert result == "Jane Smith"
-
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_list(self, mock_client_class):
-        """Test author extraction from author list."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        mock_author = Mock()
-        mock_author.fields.return_value = {"fullName": "Bob Johnson"}
-
-        fields = {"author": [mock_author]}
-        result = client._extract_author(fields)
-
-        assert result == "Bob Johnson"
-
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_string(self, mock_client_class):
-        """Test author extraction from string value."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        fields = {"authorName": "Direct Author"}
-        result = client._extract_author(fields)
-
-        assert result == "Direct Author"
-
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_fallback(self, mock_client_class):
-        """Test author extraction fallback."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        fields = {}
-        result = client._extract_author(fields)
-
-        assert result == "Unknown Author"
-
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_date_datetime_object(self, mock_client_class):
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [
+            ({"author": _entry({"name": "Jane Smith"})}, "Jane Smith"),
+            ({"author": [_entry({"fullName": "Bob Johnson"})]}, "Bob Johnson"),
+            ({"authorName": "Direct Author"}, "Direct Author"),
+            ({}, "Unknown Author"),
+        ],
+        ids=["linked_entry", "list", "string", "fallback"],
+    )
+    def test_extract_author(self, client, fields, expected):
+        """Test author extraction from each supported field shape."""
+        assert client._extract_author(fields) == expected
+
+    def test_extract_date_datetime_object(self, client):
         """Test date extraction from datetime object."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         mock_date = Mock()
         mock_date.isoformat.return_value = "2024-01-01T12:00:00Z"
 
@@ -348,14 +690,8 @@ class TestContentExtractionMethods:
 
         assert result == "2024-01-01T12:00:00Z"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_date_string(self, mock_client_class):
+    def test_extract_date_string(self, client):
         """Test date extraction from string."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         fields = {"date": "2024-01-01"}
         mock_entry = Mock()
 
@@ -363,14 +699,8 @@ class TestContentExtractionMethods:
 
         assert result == "2024-01-01"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_date_fallback_sys(self, mock_client_class):
+    def test_extract_date_fallback_sys(self, client):
         """Test date extraction fallback to sys.createdAt."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         fields = {}
         mock_entry = Mock()
         mock_entry.sys = {"createdAt": "2024-01-01T00:00:00Z"}
@@ -379,14 +709,8 @@ class TestContentExtractionMethods:
 
         assert result == "2024-01-01T00:00:00Z"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_date_no_date(self, mock_client_class):
+    def test_extract_date_no_date(self, client):
         """Test date extraction with no date available."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         fields = {}
         mock_entry = Mock()
         mock_entry.sys = {}
@@ -395,55 +719,61 @@ class TestContentExtractionMethods:
 
         assert result == "No date available"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_rich_text_success(self, mock_client_class):
+    def test_extract_rich_text_success(self, client):
         """Test rich text extraction success."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        result = client._extract_rich_text(_TWO_PARAGRAPHS)
 
-        client = ContentfulClient("space", "token")
-
-        # Mock rich text structure
-        mock_text_node = Mock()
-        mock_text_node.value = "First paragraph"
-
-        mock_text_node2 = Mock()
-        mock_text_node2.value = "Second paragraph"
+        assert result == "First paragraph\n\nSecond paragraph"
 
-        mock_paragraph1 = Mock()
-        mock_paragraph1.content = [mock_text_node]
+    def test_extract_rich_text_nested_document(self, client):
+        """Test rich text extraction from the SDK's nested dict document."""
+        document = {
+            "nodeType": "document",
+            "content": [
+                {
+                    "nodeType": "paragraph",
+                    "content": [
+                        {"nodeType": "text", "value": "Read "},
+                        {
+                            "nodeType": "hyperlink",
+                            "content": [{"nodeType": "text", "value": "this"}],
+                        },
+                        {"nodeType": "text", "value": " now."},
+                    ],
+                },
+                {"nodeType": "hr", "content": []},
+                {
+                    "nodeType": "heading-2",
+                    "content": [{"nodeType": "text", "value": "Next"}],
+                },
+            ],
+        }
 
-        mock_paragraph2 = Mock()
-        mock_paragraph2.content = [mock_text_node2]
+        result = client._extract_rich_text(document)
 
-        mock_rich_text = Mock()
-        mock_rich_text.content = [mock_paragraph1, mock_paragraph2]
+        assert result == "Read this now.\n\nNext"
 
-        result = client._extract_rich_text(mock_rich_text)
+    def test_extract_rich_text_normalizes_whitespace(self, client):
+        """Test whitespace runs collapse and blank paragraphs are dropped."""
+        document = {
+            "content": [
+                {"content": [{"value": "  Lots   of\n"}, {"value": "  space  "}]},
+                {"content": [{"value": " \n "}]},
+                {"content": [{"value": "End"}]},
+            ]
+        }
 
-        assert result == "First paragraph\n\nSecond paragraph"
+        assert client._extract_rich_text(document) == "Lots of space\n\nEnd"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_rich_text_fallback(self, mock_client_class):
+    def test_extract_rich_text_fallback(self, client):
         """Test rich text extraction fallback."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         simple_text = "Simple text content"
         result = client._extract_rich_text(simple_text)
 
         assert result == "Simple text content"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_rich_text_error(self, mock_client_class):
+    def test_extract_rich_text_error(self, client):
         """Test rich text extraction with error."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         mock_rich_text = Mock()
         mock_rich_text.content = None  # This will cause AttributeError
 
@@ -453,6 +783,30 @@ class TestContentExtractionMethods:
         assert result == str(mock_rich_text)
 
 
+class TestEntriesQuery:
+    """Test cases for the CDA query builder."""
+
+    def test_entries_query_is_canonical(self):
+        """Test query parameters are emitted in a fixed, sorted order."""
+        query = _entries_query("blogPost", 10, "-sys.createdAt", search="AI")
+
+        assert query == (
+            ("content_type", "blogPost"),
+            ("limit", 10),
+            ("order", "-sys.createdAt"),
+            ("query", "AI"),
+        )
+        assert _entries_query("blogPost", 10, "-sys.createdAt", search="AI") is query
+
+    def test_entries_query_without_search(self):
+        """Test the search parameter is omitted for plain listings."""
+        assert dict(_entries_query("blogPost", 5, "-sys.createdAt")) == {
+            "content_type": "blogPost",
+            "limit": 5,
+            "order": "-sys.createdAt",
+        }
+
+
 class TestConvenienceFunction:
     """Test cases for convenience functions."""
 
@@ -466,9 +820,21 @@ class TestConvenienceFunction:
         result = fetch_contentful_posts("space", "token", "customType", 5)
 
         mock_client_class.assert_called_once_with("space", "token")
-        mock_client.fetch_blog_posts.assert_called_once_with("customType", 5)
+        mock_client.fetch_blog_posts.assert_called_once_with(
+            "customType", 5, include_content=True
+        )
         assert result == [{"title": "Test Post"}]
 
+    @patch("src.v2_ai_mcp.contentful_client.ContentfulClient")
+    def test_fetch_contentful_posts_reuses_client(self, mock_client_class):
+        """Test repeated fetches with the same credentials share one client."""
+        fetch_contentful_posts("space", "token")
+        fetch_contentful_posts("space", "token")
+        fetch_contentful_posts("other", "token")
+
+        assert mock_client_class.call_count == 2
+        assert mock_client_class.return_value.fetch_blog_posts.call_count == 3
+
     @patch("src.v2_ai_mcp.contentful_client.ContentfulClient")
     def test_fetch_contentful_posts_defaults(self, mock_client_class):
         """Test convenience function with defaults."""
@@ -479,21 +845,17 @@ class TestConvenienceFunction:
         result = fetch_contentful_posts()
 
         mock_client_class.assert_called_once_with(None, None)
-        mock_client.fetch_blog_posts.assert_called_once_with("blogPost", 10)
+        mock_client.fetch_blog_posts.assert_called_once_with(
+            "blogPost", 10, include_content=True
+        )
         assert result == []
 
 
 class TestEdgeCases:
     """Test cases for edge cases and error conditions."""
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_error_handling(self, mock_client_class):
+    def test_extract_author_error_handling(self, client):
         """Test author extraction with various error conditions."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         # Mock author with failing fields() method
         mock_author = Mock()
         mock_author.fields.side_effect = Exception("Field error")
@@ -504,38 +866,27 @@ class TestEdgeCases:
         # Should fallback to Unknown Author
         assert result == "Unknown Author"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_empty_list(self, mock_client_class):
+    def test_extract_author_empty_list(self, client):
         """Test author extraction with empty author list."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         fields = {"author": []}
         result = client._extract_author(fields)
 
         # Empty list falls through to "other types" and gets stringified
         assert result == "[]"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_with_rich_text(self, mock_client_class):
+    def test_extract_post_data_with_rich_text(self, client):
         """Test post data extraction with rich text content."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         # Mock rich text content
         mock_content = Mock()
         mock_content.content = []  # Rich text object
 
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "Rich Text Post",
-            "content": mock_content,
-        }
-        mock_entry.sys = {"id": "rich123"}
+        mock_entry = _entry(
+            {
+                "title": "Rich Text Post",
+                "content": mock_content,
+            },
+            {"id": "rich123"},
+        )
 
         with patch.object(
             client, "_extract_rich_text", return_value="Extracted text"
@@ -545,68 +896,47 @@ class TestEdgeCases:
             mock_extract.assert_called_once_with(mock_content)
             assert result["content"] == "Extracted text"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_non_string_content(self, mock_client_class):
+    def test_extract_post_data_non_string_content(self, client):
         """Test post data extraction with non-string content."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "Number Content Post",
-            "content": 12345,  # Non-string content
-        }
-        mock_entry.sys = {"id": "num123"}
+        mock_entry = _entry(
+            {
+                "title": "Number Content Post",
+                "content": 12345,  # Non-string content
+            },
+            {"id": "num123"},
+        )
 
         result = client._extract_post_data(mock_entry)
 
         assert result["content"] == "12345"  # Should be converted to string
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_with_body_field(self, mock_client_class):
+    def test_extract_post_data_with_body_field(self, client):
         """Test post data extraction using 'body' field when 'content' not available."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {
-            "title": "Body Field Post",
-            "body": "Content from body field",  # Use body instead of content
-        }
-        mock_entry.sys = {"id": "body123"}
+        mock_entry = _entry(
+            {
+                "title": "Body Field Post",
+                "body": "Content from body field",  # Use body instead of content
+            },
+            {"id": "body123"},
+        )
 
         result = client._extract_post_data(mock_entry)
 
         assert result["content"] == "Content from body field"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_post_data_with_sys_date_fallback(self, mock_client_class):
+    def test_extract_post_data_with_sys_date_fallback(self, client):
         """Test post data extraction with sys.createdAt fallback for date."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
-        mock_entry = Mock()
-        mock_entry.fields.return_value = {"title": "Sys Date Post"}
-        mock_entry.sys = {"id": "sys123", "createdAt": "2024-02-01T10:00:00Z"}
+        mock_entry = _entry(
+            {"title": "Sys Date Post"},
+            {"id": "sys123", "createdAt": "2024-02-01T10:00:00Z"},
+        )
 
         result = client._extract_post_data(mock_entry)
 
         assert result["date"] == "2024-02-01T10:00:00Z"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_date_other_types(self, mock_client_class):
+    def test_extract_date_other_types(self, client):
         """Test date extraction with other data types."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         fields = {"publishDate": 1640995200}  # Unix timestamp as number
         mock_entry = Mock()
 
@@ -614,14 +944,8 @@ class TestEdgeCases:
 
         assert result == "1640995200"
 
-    @patch("src.v2_ai_mcp.contentful_client.contentful.Client")
-    def test_extract_author_exception_in_list_processing(self, mock_client_class):
+    def test_extract_author_exception_in_list_processing(self, client):
         """Test author extraction with exception in list processing."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-
-        client = ContentfulClient("space", "token")
-
         # Mock author list with error-prone first author
         mock_author = Mock()
         mock_author.fields.side_effect = Exception("Author field error")
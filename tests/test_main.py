@@ -1,53 +1,91 @@
 """Unit tests for the main MCP server module."""
 
-from unittest.mock import patch
+import asyncio
+import json
+import logging
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
+import pytest
+
+from src.v2_ai_mcp import contentful_client, main, summarizer
 from src.v2_ai_mcp.main import (
+    _cached_posts,
     _get_latest_posts,
     _get_post_content,
+    _get_posts_by_ids,
+    _invalidate_posts,
+    _load_summaries,
+    _refresh_posts,
+    _search_blogs,
+    _summarize_cached,
     _summarize_post,
+    _summary_cache,
+    _warm_posts_cache,
     mcp,
 )
+from src.v2_ai_mcp.summarizer import Summary, summary_request
 
 
-def test_get_latest_posts():
+@pytest.fixture
+def mock_client_class():
+    """Patch ContentfulClient and configure Contentful credentials."""
+    with (
+        patch.object(contentful_client, "ContentfulClient") as mock_client_class,
+        patch.dict(
+            os.environ,
+            {"CONTENTFUL_SPACE_ID": "space", "CONTENTFUL_ACCESS_TOKEN": "token"},
+        ),
+    ):
+        yield mock_client_class
+
+
+@pytest.fixture(scope="session")
+def sample_post():
+    """A full post as fetch_blog_posts returns it."""
+    return {
+        "title": "Test Post",
+        "author": "Ashley Rodan",
+        "date": "July 3, 2025",
+        "content": "Test content",
+        "url": "https://example.com/test",
+    }
+
+
+@pytest.fixture
+def stub_fetch(monkeypatch, sample_post):
+    """Replace fetch_blog_posts with a mock returning just sample_post."""
+    mock_fetch = Mock(return_value=[sample_post])
+    monkeypatch.setattr(main, "fetch_blog_posts", mock_fetch)
+    return mock_fetch
+
+
+@pytest.fixture(autouse=True)
+def clear_posts_cache():
+    """Ensure every test starts with empty caches and no shared client."""
+    _invalidate_posts()
+    _summary_cache.clear()
+    contentful_client._shared_client.cache_clear()
+    yield
+    _invalidate_posts()
+    _summary_cache.clear()
+    contentful_client._shared_client.cache_clear()
+
+
+def test_get_latest_posts(stub_fetch, sample_post):
     """Test the get_latest_posts function."""
-    with patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch:
-        mock_posts = [
-            {
-                "title": "Test Post",
-                "author": "Ashley Rodan",
-                "date": "July 3, 2025",
-                "content": "Test content",
-                "url": "https://example.com/test",
-            }
-        ]
-        mock_fetch.return_value = mock_posts
-
-        result = _get_latest_posts()
+    result = _get_latest_posts()
 
-        assert result == mock_posts
-        mock_fetch.assert_called_once()
+    assert result == [sample_post]
+    stub_fetch.assert_called_once_with(include_content=False)
 
 
-def test_summarize_post_valid_index():
+def test_summarize_post_valid_index(stub_fetch, sample_post):
     """Test summarize_post with valid index."""
-    mock_posts = [
-        {
-            "title": "Test Post",
-            "author": "Ashley Rodan",
-            "date": "July 3, 2025",
-            "content": "This is test content for summarization.",
-            "url": "https://example.com/test",
-        }
-    ]
-
-    with (
-        patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch,
-        patch("src.v2_ai_mcp.main.summarize") as mock_summarize,
-    ):
-        mock_fetch.return_value = mock_posts
-        mock_summarize.return_value = "This is a test summary."
+    with patch.object(main, "summarize_request") as mock_summarize:
+        mock_summarize.return_value = Summary("This is a test summary.", "gpt-4o-mini")
 
         result = _summarize_post(0)
 
@@ -60,83 +98,572 @@ def test_summarize_post_valid_index():
         }
 
         assert result == expected
-        mock_fetch.assert_called_once()
-        mock_summarize.assert_called_once_with(
-            "This is test content for summarization."
-        )
+        stub_fetch.assert_called_once()
+        mock_summarize.assert_called_once_with(summary_request(sample_post["content"]))
 
 
-def test_summarize_post_invalid_index_negative():
+def test_summarize_post_invalid_index_negative(stub_fetch):
     """Test summarize_post with negative index."""
-    mock_posts = [{"title": "Test"}]
+    result = _summarize_post(-1)
 
-    with patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch:
-        mock_fetch.return_value = mock_posts
+    assert result == {"error": "Invalid index. Available posts: 0 to 0"}
 
-        result = _summarize_post(-1)
 
-        assert result == {"error": "Invalid index. Available posts: 0 to 0"}
+def test_summarize_post_invalid_index_too_high(stub_fetch):
+    """Test summarize_post with index too high."""
+    result = _summarize_post(1)
 
+    assert result == {"error": "Invalid index. Available posts: 0 to 0"}
 
-def test_summarize_post_invalid_index_too_high():
-    """Test summarize_post with index too high."""
-    mock_posts = [{"title": "Test"}]
 
-    with patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch:
-        mock_fetch.return_value = mock_posts
+def test_summarize_post_empty_posts(stub_fetch):
+    """Test summarize_post with no posts available."""
+    stub_fetch.return_value = []
+
+    result = _summarize_post(0)
+
+    assert result == {"error": "Invalid index. Available posts: 0 to -1"}
+
+
+def test_get_post_content_valid_index(stub_fetch, sample_post):
+    """Test get_post_content with valid index."""
+    result = _get_post_content(0)
+
+    assert result == sample_post
+    stub_fetch.assert_called_once()
+
+
+def test_get_post_content_invalid_index(stub_fetch):
+    """Test get_post_content with invalid index."""
+    result = _get_post_content(5)
+
+    assert result == {"error": "Invalid index. Available posts: 0 to 0"}
+
+
+def test_posts_are_cached_between_calls(stub_fetch):
+    """Test that repeated tool calls reuse the cached post list."""
+    _get_post_content(0)
+    _get_post_content(0)
+
+    stub_fetch.assert_called_once()
+
+
+def test_latest_posts_reuse_fresh_full_list(stub_fetch, sample_post):
+    """Test the metadata listing is derived from a fresh full list."""
+    _get_post_content(0)
+    result = _get_latest_posts()
+
+    stub_fetch.assert_called_once_with(include_content=True)
+    assert result == [{**sample_post, "content": ""}]
+    assert sample_post["content"] == "Test content"
+
+
+def test_posts_cache_expires(stub_fetch):
+    """Test that the post list is refetched once the TTL has elapsed."""
+    with patch.object(main.time, "monotonic") as mock_monotonic:
+        mock_monotonic.side_effect = [0.0, 30.0, 61.0]
+
+        _get_latest_posts()
+        _get_latest_posts()
+        assert stub_fetch.call_count == 1
+
+        _get_latest_posts()
+        assert stub_fetch.call_count == 2
+
 
+def test_invalidate_posts(stub_fetch):
+    """Test that invalidating the cache forces a fresh fetch."""
+    _get_latest_posts()
+    result = _invalidate_posts()
+    _get_latest_posts()
+
+    assert result == {"message": "Post cache cleared"}
+    assert stub_fetch.call_count == 2
+
+
+def test_post_refetches_reuse_one_contentful_client(mock_client_class, sample_post):
+    """Test listing posts again reuses the Contentful client built the first time."""
+    mock_client = mock_client_class.return_value
+    mock_client.fetch_blog_posts.return_value = [sample_post]
+
+    assert _cached_posts() == [sample_post]
+    _invalidate_posts()
+    assert _cached_posts() == [sample_post]
+
+    assert mock_client.fetch_blog_posts.call_count == 2
+    mock_client_class.assert_called_once_with("space", "token")
+
+
+def test_old_posts_are_served_while_refreshing():
+    """Test an aging post list is returned at once and refetched in background."""
+    with (
+        patch.object(main, "fetch_blog_posts") as mock_fetch,
+        patch.object(main.time, "monotonic") as mock_monotonic,
+        patch.object(main.threading, "Thread") as mock_thread,
+    ):
+        mock_fetch.side_effect = [[{"title": "Old"}], [{"title": "New"}]]
+        mock_monotonic.side_effect = [0.0, 50.0, 51.0, 52.0]
+
+        _get_post_content(0)
+        assert _get_post_content(0) == {"title": "Old"}
+        mock_thread.assert_called_once()
+        mock_thread.return_value.start.assert_called_once()
+
+        _refresh_posts(*mock_thread.call_args.kwargs["args"])
+        assert _get_post_content(0) == {"title": "New"}
+        assert mock_fetch.call_count == 2
+
+
+def test_refresh_started_before_invalidation_is_discarded():
+    """Test a background refresh doesn't repopulate an invalidated cache."""
+    with patch.object(main, "fetch_blog_posts") as mock_fetch:
+        mock_fetch.side_effect = [[{"title": "Stale"}], [{"title": "Fresh"}]]
+
+        _invalidate_posts()
+        _refresh_posts(True, generation=-1)
+
+        assert _get_post_content(0) == {"title": "Fresh"}
+
+
+def test_failed_post_fetches_are_not_cached(stub_fetch, sample_post):
+    """Test an error placeholder list is returned but refetched next time."""
+    error_posts = [{"title": "Error fetching from Contentful", "id": ""}]
+    stub_fetch.side_effect = [error_posts, [sample_post]]
+
+    assert _get_post_content(0) == error_posts[0]
+    assert _get_post_content(0) == sample_post
+    assert stub_fetch.call_count == 2
+
+
+def test_failed_refresh_keeps_cached_posts(stub_fetch, sample_post):
+    """Test a background refresh that fails doesn't replace good posts."""
+    _get_post_content(0)
+    stub_fetch.return_value = [{"title": "Error fetching post", "url": "x"}]
+
+    _refresh_posts(True, generation=main._posts_generation)
+
+    assert _get_post_content(0) == sample_post
+
+
+def test_search_results_are_cached(mock_client_class):
+    """Test repeated searches are served from memory, errors are retried."""
+    mock_search = mock_client_class.return_value.search_blog_posts
+    mock_search.side_effect = [
+        [{"title": "Error searching Contentful for 'ai'", "id": ""}],
+        [{"title": "AI", "id": "a"}],
+    ]
+
+    _search_blogs("ai")
+    assert _search_blogs("ai") == [{"title": "AI", "id": "a"}]
+    assert _search_blogs("ai") == [{"title": "AI", "id": "a"}]
+    assert mock_search.call_count == 2
+
+
+def test_cached_search_is_served_during_a_post_fetch(mock_client_class):
+    """Test result-cache hits don't wait on the post list's cache lock."""
+    mock_client_class.return_value.search_blog_posts.return_value = [
+        {"title": "AI", "id": "a"}
+    ]
+    _search_blogs("ai")
+
+    with main._posts_cache_lock:
+        assert _search_blogs("ai") == [{"title": "AI", "id": "a"}]
+
+
+def test_search_started_before_invalidation_is_not_cached(mock_client_class):
+    """Test a search running when the caches are cleared doesn't repopulate them."""
+
+    def search_during_invalidation(*args, **kwargs):
+        _invalidate_posts()
+        return [{"title": "Old", "id": "a"}]
+
+    mock_search = mock_client_class.return_value.search_blog_posts
+    mock_search.side_effect = search_during_invalidation
+    _search_blogs("ai")
+
+    mock_search.side_effect = None
+    mock_search.return_value = [{"title": "New", "id": "a"}]
+    assert _search_blogs("ai") == [{"title": "New", "id": "a"}]
+
+
+def test_summarize_post_fetches_single_post_after_expiry(mock_client_class):
+    """Test summarize_post fetches only the requested post once the list expired."""
+    single_post = {
+        "title": "Fresh Post",
+        "date": "July 3, 2025",
+        "author": "Ashley Rodan",
+        "url": "https://example.com/fresh",
+        "content": "Fresh content",
+        "id": "b",
+    }
+
+    with (
+        patch.object(main, "fetch_blog_posts") as mock_fetch,
+        patch.object(main, "summarize_request") as mock_summarize,
+        patch.object(main.time, "monotonic") as mock_monotonic,
+    ):
+        mock_fetch.return_value = [{"title": "A", "id": "a"}, {"title": "B", "id": "b"}]
+        mock_monotonic.side_effect = [0.0, 61.0]
+        mock_client = mock_client_class.return_value
+        mock_client.fetch_single_post.return_value = single_post
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
+
+        _get_latest_posts()
         result = _summarize_post(1)
 
-        assert result == {"error": "Invalid index. Available posts: 0 to 0"}
+        mock_fetch.assert_called_once()
+        mock_client.fetch_single_post.assert_called_once_with("b")
+        mock_summarize.assert_called_once_with(summary_request("Fresh content"))
+        assert result["title"] == "Fresh Post"
 
 
-def test_summarize_post_empty_posts():
-    """Test summarize_post with no posts available."""
-    with patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch:
-        mock_fetch.return_value = []
+def test_summarize_post_after_listing_skips_full_fetch(mock_client_class):
+    """Test summarizing a just-listed post fetches that post, not every post."""
+    with (
+        patch.object(main, "fetch_blog_posts") as mock_fetch,
+        patch.object(main, "summarize_request") as mock_summarize,
+    ):
+        mock_fetch.return_value = [{"title": "A", "content": "", "id": "a"}]
+        mock_client = mock_client_class.return_value
+        mock_client.fetch_single_post.return_value = {
+            "title": "A",
+            "date": "",
+            "author": "",
+            "url": "",
+            "content": "Body",
+            "id": "a",
+        }
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
 
-        result = _summarize_post(0)
+        _get_latest_posts()
+        _summarize_post(0)
 
-        assert result == {"error": "Invalid index. Available posts: 0 to -1"}
+        mock_fetch.assert_called_once_with(include_content=False)
+        mock_client.fetch_single_post.assert_called_once_with("a")
+        mock_summarize.assert_called_once_with(summary_request("Body"))
 
 
-def test_get_post_content_valid_index():
-    """Test get_post_content with valid index."""
+def test_summarize_post_falls_back_to_list_when_single_fetch_fails(mock_client_class):
+    """Test summarize_post refetches the list if the single-post fetch fails."""
     mock_posts = [
         {
             "title": "Test Post",
-            "author": "Ashley Rodan",
             "date": "July 3, 2025",
-            "content": "Full content here",
+            "author": "Ashley Rodan",
             "url": "https://example.com/test",
+            "content": "Listed content",
+            "id": "a",
         }
     ]
 
-    with patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch:
+    with (
+        patch.object(main, "fetch_blog_posts") as mock_fetch,
+        patch.object(main, "summarize_request") as mock_summarize,
+        patch.object(main.time, "monotonic") as mock_monotonic,
+    ):
         mock_fetch.return_value = mock_posts
+        mock_monotonic.side_effect = [0.0, 61.0, 62.0]
+        mock_client = mock_client_class.return_value
+        mock_client.fetch_single_post.return_value = {"title": "Error fetching post"}
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
 
-        result = _get_post_content(0)
+        _get_latest_posts()
+        result = _summarize_post(0)
 
-        assert result == mock_posts[0]
-        mock_fetch.assert_called_once()
+        assert mock_fetch.call_count == 2
+        mock_summarize.assert_called_once_with(summary_request("Listed content"))
+        assert result["title"] == "Test Post"
 
 
-def test_get_post_content_invalid_index():
-    """Test get_post_content with invalid index."""
-    mock_posts = [{"title": "Test"}]
+def test_summaries_are_cached_by_content():
+    """Test identical content is only summarized once."""
+    with patch.object(main, "summarize_request") as mock_summarize:
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
 
-    with patch("src.v2_ai_mcp.main.fetch_blog_posts") as mock_fetch:
-        mock_fetch.return_value = mock_posts
+        assert _summarize_cached("Same content") == "Summary."
+        assert _summarize_cached("Same content") == "Summary."
+        _summarize_cached("Other content")
 
-        result = _get_post_content(5)
+        assert mock_summarize.call_count == 2
 
-        assert result == {"error": "Invalid index. Available posts: 0 to 0"}
 
+def test_summary_cache_is_keyed_by_model():
+    """Test changing the summarization model doesn't reuse old summaries."""
+    with patch.object(main, "summarize_request") as mock_summarize:
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
 
-def test_mcp_server_initialization():
-    """Test that MCP server is properly initialized."""
-    assert mcp is not None
-    assert hasattr(mcp, "run")
+        _summarize_cached("Same content")
+        with patch.dict("os.environ", {"OPENAI_MODEL": "gpt-4o"}):
+            _summarize_cached("Same content")
+
+        assert mock_summarize.call_count == 2
+
+
+def test_summary_errors_are_not_cached():
+    """Test a failed summary is retried on the next call."""
+    with patch.object(main, "summarize_request") as mock_summarize:
+        mock_summarize.side_effect = [
+            Summary(
+                "Error generating summary: API Error", "gpt-4o-mini", error="API Error"
+            ),
+            Summary("Summary.", "gpt-4o-mini"),
+        ]
+
+        _summarize_cached("Content")
+        result = _summarize_cached("Content")
+
+        assert result == "Summary."
+        assert mock_summarize.call_count == 2
+
+
+def test_summaries_persist_across_restarts(tmp_path):
+    """Test summaries saved to the cache file are reused after a restart."""
+    cache_file = str(tmp_path / "summaries.json")
+
+    with (
+        patch.object(main, "SUMMARY_CACHE_FILE", cache_file),
+        patch.object(main, "summarize_request") as mock_summarize,
+    ):
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
+        _summarize_cached("Content")
+
+        _summary_cache.clear()
+        _load_summaries()
+
+        assert _summarize_cached("Content") == "Summary."
+        mock_summarize.assert_called_once_with(summary_request("Content"))
+
+
+def test_unreadable_summary_file_is_ignored(tmp_path):
+    """Test a corrupt cache file leaves the summary cache empty."""
+    cache_file = tmp_path / "summaries.json"
+    cache_file.write_text("not json")
+
+    with patch.object(main, "SUMMARY_CACHE_FILE", str(cache_file)):
+        _load_summaries()
+
+    assert _summary_cache == {}
+
+
+@pytest.mark.parametrize(
+    ("saved", "expected"),
+    [
+        ([1, 2], {}),
+        ({"zz": "Bad key", "ab": "Kept"}, {b"\xab": "Kept"}),
+        ({"ab": {"text": "Not a string"}}, {}),
+    ],
+)
+def test_misshapen_summary_file_is_skipped(tmp_path, saved, expected):
+    """Test valid JSON of the wrong shape loads only its well-formed entries."""
+    cache_file = tmp_path / "summaries.json"
+    cache_file.write_text(json.dumps(saved))
+
+    with patch.object(main, "SUMMARY_CACHE_FILE", str(cache_file)):
+        _load_summaries()
+
+    assert _summary_cache == expected
+
+
+def test_summary_file_is_written_outside_the_cache_lock(tmp_path):
+    """Test saving summaries doesn't hold the cache lock during file I/O."""
+    cache_file = tmp_path / "summaries.json"
+    locked_during_write = []
+    real_dump = json.dump
+
+    def dump(obj, f):
+        locked_during_write.append(main._summary_cache_lock.locked())
+        real_dump(obj, f)
+
+    with (
+        patch.object(main, "SUMMARY_CACHE_FILE", str(cache_file)),
+        patch.object(main, "summarize_request") as mock_summarize,
+        patch.object(main.json, "dump", side_effect=dump),
+    ):
+        mock_summarize.return_value = Summary("Summary.", "gpt-4o-mini")
+        _summarize_cached("Content")
+
+    assert locked_during_write == [False]
+    assert list(json.loads(cache_file.read_text()).values()) == ["Summary."]
+
+
+def test_concurrent_identical_summaries_call_summarizer_once():
+    """Test concurrent requests for the same content share one summary."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_summarize(request):
+        started.set()
+        release.wait(5)
+        return Summary("Summary.", "gpt-4o-mini")
+
+    with patch.object(main, "summarize_request", side_effect=slow_summarize) as mock:
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(_summarize_cached("Same")))
+            for _ in range(3)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["Summary."] * 3
+        mock.assert_called_once_with(summary_request("Same"))
+
+
+def test_summary_truncates_long_content_once(caplog):
+    """Test the cache key and the request share one truncation of the content."""
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="Summary."))],
+        usage=None,
+    )
+    with (
+        patch.object(summarizer, "MAX_INPUT_CHARS", 12),
+        patch.object(summarizer, "_client") as mock_client,
+        caplog.at_level(logging.INFO, logger=summarizer.logger.name),
+    ):
+        mock_client.return_value.chat.completions.create.return_value = response
+
+        assert _summarize_cached("alpha beta gamma delta") == "Summary."
+
+    truncations = [r for r in caplog.records if r.message.startswith("Truncating")]
+    assert len(truncations) == 1
+
+
+def test_post_fetch_runs_outside_the_cache_lock(stub_fetch, sample_post):
+    """Test a slow post fetch neither holds the cache lock nor runs twice."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch(include_content):
+        started.set()
+        release.wait(5)
+        return [sample_post]
+
+    stub_fetch.side_effect = slow_fetch
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(_cached_posts()))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    started.wait(5)
+    threads[1].start()
+
+    assert main._posts_cache_lock.acquire(timeout=1)
+    main._posts_cache_lock.release()
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [[sample_post]] * 2
+    stub_fetch.assert_called_once_with(include_content=True)
+
+
+def test_listing_waits_for_the_warm_up_fetch(stub_fetch, sample_post):
+    """Test a metadata listing mid-prefetch waits for it instead of fetching."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch(include_content):
+        started.set()
+        release.wait(5)
+        return [sample_post]
+
+    stub_fetch.side_effect = slow_fetch
+    warm_up = _warm_posts_cache()
+    started.wait(5)
+    results = []
+    listing = threading.Thread(target=lambda: results.append(_get_latest_posts()))
+    listing.start()
+    listing.join(0.2)
+
+    release.set()
+    warm_up.join(5)
+    listing.join(5)
+
+    assert results == [[{**sample_post, "content": ""}]]
+    stub_fetch.assert_called_once_with(include_content=True)
+
+
+def test_contentful_client_is_reused_across_calls(mock_client_class):
+    """Test tool calls share one Contentful client instead of rebuilding it."""
+    mock_client_class.return_value.search_blog_posts.return_value = []
+
+    _search_blogs("ai")
+    _search_blogs("ml")
+
+    mock_client_class.assert_called_once_with("space", "token")
+    assert mock_client_class.return_value.search_blog_posts.call_count == 2
+
+
+def test_get_posts_by_ids_fetches_only_uncached(mock_client_class):
+    """Test cached posts are reused and only missing IDs are fetched."""
+    cached_post = {"title": "Cached", "id": "a"}
+    fetched_post = {"title": "Fetched", "id": "b"}
+
+    with patch.object(main, "fetch_blog_posts") as mock_fetch:
+        mock_fetch.return_value = [cached_post]
+        mock_client = mock_client_class.return_value
+        mock_client.fetch_many.return_value = [fetched_post]
+
+        _get_post_content(0)
+        result = _get_posts_by_ids(["b", "a"])
+
+        mock_client.fetch_many.assert_called_once_with(["b"])
+        assert result == [fetched_post, cached_post]
+
+
+def test_get_posts_by_ids_all_cached(mock_client_class):
+    """Test no request is made when every requested post is cached."""
+    with patch.object(main, "fetch_blog_posts") as mock_fetch:
+        mock_fetch.return_value = [{"title": "Cached", "id": "a"}]
+
+        _get_post_content(0)
+        result = _get_posts_by_ids(["a"])
+
+        mock_client_class.assert_not_called()
+        assert result == [{"title": "Cached", "id": "a"}]
+
+
+def test_get_posts_by_ids_not_configured():
+    """Test fetching uncached posts without Contentful configuration."""
+    with patch.dict(os.environ, {}, clear=True):
+        result = _get_posts_by_ids(["a"])
+
+    assert "Contentful not configured" in result["error"]
+
+
+def test_warm_posts_cache():
+    """Test the startup prefetch fills the cache used by later tool calls."""
+    with patch.object(main, "fetch_blog_posts") as mock_fetch:
+        mock_fetch.return_value = [{"title": "Warm", "content": "Body"}]
+
+        _warm_posts_cache().join(timeout=5)
+        result = _get_post_content(0)
+
+        mock_fetch.assert_called_once_with(include_content=True)
+        assert result == {"title": "Warm", "content": "Body"}
+
+
+def test_tools_run_off_the_event_loop():
+    """Test async tools return the blocking helper's result via the server."""
+    from fastmcp import Client
+
+    async def call_tool():
+        async with Client(mcp) as client:
+            return await client.call_tool("get_latest_posts", {})
+
+    with patch.object(main, "fetch_blog_posts") as mock_fetch:
+        mock_fetch.return_value = [{"title": "Threaded Post"}]
+
+        result = asyncio.run(call_tool())
+
+    assert "Threaded Post" in result.content[0].text
 
 
 def test_tools_are_registered():
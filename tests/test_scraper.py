@@ -1,16 +1,46 @@
 """Unit tests for the scraper module."""
 
+from collections import OrderedDict
 from unittest.mock import patch
 
-import responses
-
-from src.v2_ai_mcp.scraper import fetch_blog_post, fetch_blog_posts
-
-
-@responses.activate
-def test_fetch_blog_post_success():
-    """Test successful blog post fetching."""
-    test_html = """
+import pytest
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+
+from src.v2_ai_mcp import contentful_client, scraper
+from src.v2_ai_mcp.scraper import (
+    _SESSION,
+    fetch_blog_post,
+    fetch_blog_post_list,
+    fetch_blog_posts,
+)
+
+# Date strings as they appear on a page, and as fetch_blog_post reports them
+DATE_FORMATS = [
+    ("July 15, 2024", "July 15, 2024"),
+    ("15 July 2024", "15 July 2024"),
+    ("07/15/2024", "07/15/2024"),
+    ("2024-07-15", "2024-07-15"),
+]
+
+# Page holding one of DATE_FORMATS, served as date-test-{i}
+DATE_PAGE = """
+<html>
+    <body>
+        <h1>Date Test {i}</h1>
+        <div>
+            <p>Published on {date}</p>
+            <p>Content here.</p>
+        </div>
+    </body>
+</html>
+"""
+
+# HTML pages served to fetch_blog_post, by URL
+URL_BODIES = {
+    "https://example.com/test-post": """
     <html>
         <head><title>Test Page</title></head>
         <body>
@@ -21,16 +51,129 @@ def test_fetch_blog_post_success():
             </div>
         </body>
     </html>
+    """,
+    "https://example.com/date-test": """
+    <html>
+        <body>
+            <h1>Test Post</h1>
+            <div>
+                <p>Ashley RodanJuly 15, 2024</p>
+                <p>Content paragraph.</p>
+            </div>
+        </body>
+    </html>
+    """,
+    "https://example.com/empty": "<html><body><h1>Empty Post</h1></body></html>",
+    "https://example.com/date-clean": """
+    <html>
+        <body>
+            <h1>Test Post</h1>
+            <div>
+                <p>Some text Ashley RodanDecember 25, 2024 more text</p>
+                <p>Content here.</p>
+            </div>
+        </body>
+    </html>
+    """,
+    "https://example.com/fallback": """
+    <html>
+        <body>
+            <h1>Fallback Test</h1>
+            <script>console.log('remove me');</script>
+            <style>.hidden { display: none; }</style>
+            <p>First paragraph</p>
+            <p>Second paragraph</p>
+            <p></p>
+            <p>Third paragraph with content</p>
+        </body>
+    </html>
+    """,
+    "https://example.com/layout": """
+    <html>
+        <body>
+            <h1>Layout Test</h1>
+            <div class="content"><span>Navigation blurb</span></div>
+            <article><p>Article body.</p></article>
+            <p>Outside paragraph.</p>
+        </body>
+    </html>
+    """,
+    "https://example.com/header": """
+    <html>
+        <body>
+            <header>
+                <h1>Header Title</h1>
+                <time datetime="2024-03-01">March 1, 2024</time>
+                <p>Header tagline.</p>
+            </header>
+            <nav><p>Menu</p></nav>
+            <p>Body paragraph.</p>
+            <footer><p>Copyright</p></footer>
+            <script>var p = "<p>not content</p>";</script>
+        </body>
+    </html>
+    """,
+}
+URL_BODIES.update(
+    (
+        f"https://example.com/date-test-{i}",
+        DATE_PAGE.format(i=i, date=date_in_html),
+    )
+    for i, (date_in_html, _) in enumerate(DATE_FORMATS)
+)
+URL_BODIES.update(
+    (
+        f"https://example.com/post-{i}",
+        f"<html><body><h1>Post {i}</h1><p>Body {i}</p></body></html>",
+    )
+    for i in range(3)
+)
+
+
+class PageAdapter(HTTPAdapter):
+    """Transport adapter answering GETs from a URL -> (body, content type) table.
+
+    URLs missing from the table get a 404.
     """
 
-    responses.add(
-        responses.GET,
-        "https://example.com/test-post",
-        body=test_html,
-        status=200,
-        content_type="text/html",
+    def __init__(self, pages: dict[str, tuple[bytes, str]]):
+        super().__init__()
+        self.pages = pages
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if request.url in self.pages:
+            body, response.headers["Content-Type"] = self.pages[request.url]
+            response.status_code, response.reason = 200, "OK"
+        else:
+            body = b""
+            response.status_code, response.reason = 404, "Not Found"
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_http():
+    """Serve every example.com page the module fetches through the shared session."""
+    pages = {url: (body.encode(), "text/html") for url, body in URL_BODIES.items()}
+    pages["https://example.com/latin"] = (
+        "<html><body><h1>Café</h1><p>Crème brûlée</p></body></html>".encode(
+            "iso-8859-1"
+        ),
+        "text/html; charset=iso-8859-1",
     )
+    with pytest.MonkeyPatch.context() as mp:
+        # Mount on a copy of the adapter table, restored when the module ends
+        mp.setattr(_SESSION, "adapters", OrderedDict(_SESSION.adapters))
+        _SESSION.mount("https://example.com/", PageAdapter(pages))
+        yield
 
+
+def test_fetch_blog_post_success():
+    """Test successful blog post fetching."""
     result = fetch_blog_post("https://example.com/test-post")
 
     assert result["title"] == "Test Blog Post Title"
@@ -40,29 +183,8 @@ def test_fetch_blog_post_success():
     assert "second paragraph" in result["content"]
 
 
-@responses.activate
 def test_fetch_blog_post_with_date():
     """Test blog post fetching with date extraction."""
-    test_html = """
-    <html>
-        <body>
-            <h1>Test Post</h1>
-            <div>
-                <p>Ashley RodanJuly 15, 2024</p>
-                <p>Content paragraph.</p>
-            </div>
-        </body>
-    </html>
-    """
-
-    responses.add(
-        responses.GET,
-        "https://example.com/date-test",
-        body=test_html,
-        status=200,
-        content_type="text/html",
-    )
-
     result = fetch_blog_post("https://example.com/date-test")
 
     assert result["title"] == "Test Post"
@@ -70,11 +192,8 @@ def test_fetch_blog_post_with_date():
     assert result["author"] == "Ashley Rodan"
 
 
-@responses.activate
 def test_fetch_blog_post_request_error():
     """Test handling of request errors."""
-    responses.add(responses.GET, "https://example.com/error", status=404)
-
     result = fetch_blog_post("https://example.com/error")
 
     assert result["title"] == "Error fetching post"
@@ -82,86 +201,24 @@ def test_fetch_blog_post_request_error():
     assert result["url"] == "https://example.com/error"
 
 
-@responses.activate
 def test_fetch_blog_post_no_content():
     """Test handling of pages with no content."""
-    test_html = """
-    <html>
-        <head><title>Empty Page</title></head>
-        <body>
-            <h1>Empty Post</h1>
-        </body>
-    </html>
-    """
-
-    responses.add(
-        responses.GET,
-        "https://example.com/empty",
-        body=test_html,
-        status=200,
-        content_type="text/html",
-    )
-
     result = fetch_blog_post("https://example.com/empty")
 
     assert result["title"] == "Empty Post"
     assert result["content"] == "Content not found"
 
 
-@responses.activate
 def test_fetch_blog_post_date_cleaning():
     """Test date extraction and cleaning functionality."""
-    test_html = """
-    <html>
-        <body>
-            <h1>Test Post</h1>
-            <div>
-                <p>Some text Ashley RodanDecember 25, 2024 more text</p>
-                <p>Content here.</p>
-            </div>
-        </body>
-    </html>
-    """
-
-    responses.add(
-        responses.GET,
-        "https://example.com/date-clean",
-        body=test_html,
-        status=200,
-        content_type="text/html",
-    )
-
     result = fetch_blog_post("https://example.com/date-clean")
 
     assert result["date"] == "December 25, 2024"
     assert "Rodan" not in result["date"]
 
 
-@responses.activate
 def test_fetch_blog_post_fallback_content():
     """Test fallback content extraction when main selectors fail."""
-    test_html = """
-    <html>
-        <body>
-            <h1>Fallback Test</h1>
-            <script>console.log('remove me');</script>
-            <style>.hidden { display: none; }</style>
-            <p>First paragraph</p>
-            <p>Second paragraph</p>
-            <p></p>
-            <p>Third paragraph with content</p>
-        </body>
-    </html>
-    """
-
-    responses.add(
-        responses.GET,
-        "https://example.com/fallback",
-        body=test_html,
-        status=200,
-        content_type="text/html",
-    )
-
     result = fetch_blog_post("https://example.com/fallback")
 
     assert "First paragraph" in result["content"]
@@ -171,44 +228,75 @@ def test_fetch_blog_post_fallback_content():
     assert ".hidden" not in result["content"]
 
 
-@responses.activate
-def test_fetch_blog_post_various_date_formats():
+@pytest.mark.parametrize(
+    ("i", "expected_date"),
+    [(i, expected_date) for i, (_, expected_date) in enumerate(DATE_FORMATS)],
+    ids=[date_in_html for date_in_html, _ in DATE_FORMATS],
+)
+def test_fetch_blog_post_various_date_formats(i, expected_date):
     """Test different date format extraction."""
-    test_cases = [
-        ("July 15, 2024", "July 15, 2024"),
-        ("15 July 2024", "15 July 2024"),
-        ("07/15/2024", "07/15/2024"),
-        ("2024-07-15", "2024-07-15"),
-    ]
+    result = fetch_blog_post(f"https://example.com/date-test-{i}")
 
-    for i, (date_in_html, expected_date) in enumerate(test_cases):
-        test_html = f"""
-        <html>
-            <body>
-                <h1>Date Test {i}</h1>
-                <div>
-                    <p>Published on {date_in_html}</p>
-                    <p>Content here.</p>
-                </div>
-            </body>
-        </html>
-        """
-
-        responses.add(
-            responses.GET,
-            f"https://example.com/date-test-{i}",
-            body=test_html,
-            status=200,
-            content_type="text/html",
-        )
+    assert result["date"] == expected_date
+
+
+def test_fetch_blog_post_skips_content_areas_without_paragraphs():
+    """Test the first content area holding paragraphs is used."""
+    result = fetch_blog_post("https://example.com/layout")
+
+    assert result["content"] == "Article body."
+
+
+def test_fetch_blog_post_uses_declared_charset():
+    """Test the page is decoded with the charset from the response headers."""
+    with patch.object(scraper, "BeautifulSoup", wraps=BeautifulSoup) as mock_soup:
+        result = fetch_blog_post("https://example.com/latin")
+
+    assert mock_soup.call_args.kwargs["from_encoding"] == "iso-8859-1"
+    assert result["title"] == "Café"
+    assert result["content"] == "Crème brûlée"
 
-        result = fetch_blog_post(f"https://example.com/date-test-{i}")
-        assert result["date"] == expected_date
+
+def test_fetch_blog_post_reuses_session():
+    """Test pages are fetched through the shared keep-alive session."""
+    with patch.object(scraper, "_SESSION") as mock_session:
+        mock_session.get.return_value.content = b"<h1>Post</h1><p>Body</p>"
+        mock_session.get.return_value.headers = {}
+
+        fetch_blog_post("https://example.com/a")
+        fetch_blog_post("https://example.com/b")
+
+        assert mock_session.get.call_count == 2
+        mock_session.get.assert_called_with("https://example.com/b", timeout=30)
+
+
+def test_fetch_blog_post_reads_header_before_dropping_chrome():
+    """Test the title and date may sit in the header, which content excludes."""
+    result = fetch_blog_post("https://example.com/header")
+
+    assert result["title"] == "Header Title"
+    assert result["date"] == "March 1, 2024"
+    assert result["content"] == "Body paragraph."
+
+
+def test_fetch_blog_post_list_preserves_order():
+    """Test several posts are fetched and returned in the order requested."""
+    urls = [f"https://example.com/post-{i}" for i in range(3)]
+
+    result = fetch_blog_post_list([*urls, "https://example.com/missing"])
+
+    assert [post["title"] for post in result] == [
+        "Post 0",
+        "Post 1",
+        "Post 2",
+        "Error fetching post",
+    ]
+    assert result[1]["content"] == "Body 1"
 
 
 def test_fetch_blog_posts():
     """Test the main fetch_blog_posts function."""
-    with patch("src.v2_ai_mcp.scraper.fetch_blog_post") as mock_fetch:
+    with patch.object(scraper, "fetch_blog_post") as mock_fetch:
         mock_fetch.return_value = {
             "title": "Test Post",
             "author": "Ashley Rodan",
@@ -225,3 +313,20 @@ def test_fetch_blog_posts():
         mock_fetch.assert_called_once_with(
             "https://www.v2.ai/insights/adopting-AI-assistants-while-balancing-risks"
         )
+
+
+def test_fetch_blog_posts_metadata_only():
+    """Test include_content is passed through to the Contentful fetch."""
+    with (
+        patch.dict(
+            "os.environ",
+            {"CONTENTFUL_SPACE_ID": "space", "CONTENTFUL_ACCESS_TOKEN": "token"},
+        ),
+        patch.object(contentful_client, "fetch_contentful_posts") as mock_contentful,
+    ):
+        mock_contentful.return_value = [{"title": "Contentful Post"}]
+
+        result = fetch_blog_posts(include_content=False)
+
+        assert result == [{"title": "Contentful Post"}]
+        assert mock_contentful.call_args[1]["include_content"] is False
@@ -1,86 +1,373 @@
 """Unit tests for the summarizer module."""
 
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
 
-from src.v2_ai_mcp.summarizer import summarize
+import orjson
+import pytest
 
+from src.v2_ai_mcp import summarizer
+from src.v2_ai_mcp.summarizer import (
+    Summary,
+    _client,
+    collect_bulk,
+    summarize,
+    summarize_batch,
+    summarize_bulk,
+    summarize_many,
+    summarize_result,
+    summarize_stream,
+    summary_key,
+    summary_request,
+)
 
-@patch("src.v2_ai_mcp.summarizer.OpenAI")
-def test_summarize_success(mock_openai):
-    """Test successful text summarization."""
-    # Mock the OpenAI client and response
-    mock_client = MagicMock()
-    mock_openai.return_value = mock_client
 
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "This is a test summary."
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Ensure every test builds its own (mocked) OpenAI client."""
+    _client.cache_clear()
+    yield
+    _client.cache_clear()
 
-    mock_client.chat.completions.create.return_value = mock_response
 
-    # Test the summarize function
-    result = summarize("This is a long blog post content that needs to be summarized.")
+def _completion(content=None, usage=None):
+    """Build a chat completion response with a single choice."""
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
 
-    assert result == "This is a test summary."
-    mock_client.chat.completions.create.assert_called_once()
+
+# Mock OpenAI client shared by the module; openai_client resets it per test
+_CLIENT = MagicMock()
+
+
+@pytest.fixture
+def openai_client(monkeypatch):
+    """Swap the OpenAI constructor for one handing out a freshly reset mock client.
+
+    Chat completions answer with a one-choice response, so tests only need to
+    fill in its message content.
+    """
+    _CLIENT.reset_mock(return_value=True, side_effect=True)
+    _CLIENT.chat.completions.create.return_value = _completion()
+    monkeypatch.setattr(summarizer, "OpenAI", Mock(return_value=_CLIENT))
+    return _CLIENT
+
+
+@pytest.mark.parametrize(
+    ("text", "reply", "expected"),
+    [
+        (
+            "This is a long blog post content that needs to be summarized.",
+            "This is a test summary.",
+            "This is a test summary.",
+        ),
+        ("Test content", Exception("API Error"), "Error generating summary: API Error"),
+        ("", "No content to summarize.", "No content to summarize."),
+    ],
+    ids=["success", "api-error", "empty-content"],
+)
+def test_summarize(openai_client, text, reply, expected):
+    """Test summarize returns the reply, or the error message when it fails."""
+    create = openai_client.chat.completions.create
+    if isinstance(reply, Exception):
+        create.side_effect = reply
+    else:
+        create.return_value.choices[0].message.content = reply
+
+    result = summarize(text)
+
+    assert result == expected
+    create.assert_called_once()
 
     # Verify the API call parameters
-    call_args = mock_client.chat.completions.create.call_args
-    assert call_args[1]["model"] == "gpt-4"
-    assert call_args[1]["max_tokens"] == 500
-    assert call_args[1]["temperature"] == 0.3
+    call_args = create.call_args
+    assert call_args[1]["model"] == "gpt-4o-mini"
+    assert call_args[1]["max_tokens"] == 160
+    assert call_args[1]["temperature"] == 0.0
     assert len(call_args[1]["messages"]) == 2
     assert call_args[1]["messages"][0]["role"] == "system"
     assert call_args[1]["messages"][1]["role"] == "user"
     assert "summarize this blog post" in call_args[1]["messages"][1]["content"].lower()
 
 
-@patch("src.v2_ai_mcp.summarizer.OpenAI")
-def test_summarize_api_error(mock_openai):
-    """Test handling of OpenAI API errors."""
-    mock_client = MagicMock()
-    mock_openai.return_value = mock_client
+def test_summarize_with_api_key(monkeypatch, openai_client):
+    """Test that API key is properly retrieved from environment."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-api-key")
+    monkeypatch.delenv("OPENAI_MODEL", raising=False)
 
-    # Mock an API exception
-    mock_client.chat.completions.create.side_effect = Exception("API Error")
+    mock_response = openai_client.chat.completions.create.return_value
+    mock_response.choices[0].message.content = "Summary result."
 
     result = summarize("Test content")
 
-    assert result == "Error generating summary: API Error"
+    summarizer.OpenAI.assert_called_once_with(api_key="test-api-key", max_retries=4)
+    call_args = openai_client.chat.completions.create.call_args
+    assert call_args[1]["model"] == "gpt-4o-mini"
+    assert result == "Summary result."
 
 
-@patch("src.v2_ai_mcp.summarizer.os.getenv")
-@patch("src.v2_ai_mcp.summarizer.OpenAI")
-def test_summarize_with_api_key(mock_openai, mock_getenv):
-    """Test that API key is properly retrieved from environment."""
-    mock_getenv.return_value = "test-api-key"
-    mock_client = MagicMock()
-    mock_openai.return_value = mock_client
+def test_summarize_model_from_env(monkeypatch, openai_client):
+    """Test the summarization model can be overridden with OPENAI_MODEL."""
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
 
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "Summary result."
-    mock_client.chat.completions.create.return_value = mock_response
+    summarize("Test content")
 
-    result = summarize("Test content")
+    call_args = openai_client.chat.completions.create.call_args
+    assert call_args[1]["model"] == "gpt-4o"
 
-    mock_getenv.assert_called_once_with("OPENAI_API_KEY")
-    mock_openai.assert_called_once_with(api_key="test-api-key")
-    assert result == "Summary result."
 
+def test_summarize_reuses_client(openai_client):
+    """Test the OpenAI client is built once and shared across calls."""
+    mock_response = openai_client.chat.completions.create.return_value
+    mock_response.choices[0].message.content = "Summary."
+
+    summarize("First post")
+    summarize("Second post")
+
+    summarizer.OpenAI.assert_called_once()
+    assert openai_client.chat.completions.create.call_count == 2
+
+
+def test_client_shares_one_connection_pool():
+    """Test every summary goes through the same pooled HTTP client."""
+    first = _client("test-api-key")
+    second = _client("test-api-key")
+
+    assert first is second
+    assert id(first._client) == id(second._client)
+    assert _client("other-api-key") is not first
+
+
+def test_summarize_many_preserves_order(monkeypatch):
+    """Test concurrent summaries come back in the order of their inputs."""
+    mock_summarize = Mock(side_effect=lambda text: f"Summary of {text}")
+    monkeypatch.setattr(summarizer, "summarize", mock_summarize)
+
+    result = summarize_many(["a", "b", "c"])
+
+    assert result == ["Summary of a", "Summary of b", "Summary of c"]
+    assert mock_summarize.call_count == 3
+
+
+def test_summarize_stream_yields_pieces(openai_client):
+    """Test streamed summaries yield each non-empty delta as it arrives."""
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=c))])
+        for c in ["This is ", None, "a summary."]
+    ]
+    usage_chunk = SimpleNamespace(choices=[])
+    openai_client.chat.completions.create.return_value = iter(chunks + [usage_chunk])
+
+    result = list(summarize_stream("Test content"))
+
+    assert result == ["This is ", "a summary."]
+    call_args = openai_client.chat.completions.create.call_args
+    assert call_args[1]["stream"] is True
+    assert call_args[1]["model"] == "gpt-4o-mini"
+
+
+def test_summarize_batch_single_request(openai_client):
+    """Test a batch of posts is summarized by one request, in input order."""
+    mock_response = openai_client.chat.completions.create.return_value
+    mock_response.choices[
+        0
+    ].message.content = '{"1": "Summary of b", "0": "Summary of a"}'
+
+    result = summarize_batch(["a", "b", "c"])
+
+    assert result == [
+        "Summary of a",
+        "Summary of b",
+        "Error generating summary: missing from batch response",
+    ]
+    openai_client.chat.completions.create.assert_called_once()
+    call_args = openai_client.chat.completions.create.call_args
+    assert call_args[1]["response_format"] == {"type": "json_object"}
+    assert "<<POST i=2>>\nc\n<<END>>" in call_args[1]["messages"][1]["content"]
+
+
+def test_summarize_batch_rejects_non_string_summaries(openai_client):
+    """Test a nested answer is reported missing rather than returned as is."""
+    mock_response = openai_client.chat.completions.create.return_value
+    mock_response.choices[0].message.content = '{"0": {"summary": "a"}, "1": ["b"]}'
+
+    result = summarize_batch(["a", "b"])
+
+    assert result == ["Error generating summary: missing from batch response"] * 2
+
+
+def test_summarize_batch_splits_large_batches(monkeypatch, openai_client):
+    """Test batches larger than MAX_BATCH_SIZE are split across requests."""
+    monkeypatch.setattr(summarizer, "MAX_BATCH_SIZE", 2)
+    openai_client.chat.completions.create.side_effect = Exception("API Error")
+
+    result = summarize_batch(["a", "b", "c"])
+
+    assert result == ["Error generating summary: API Error"] * 3
+    assert openai_client.chat.completions.create.call_count == 2
+
+
+def test_summarize_bulk_submits_batch(openai_client):
+    """Test bulk summaries are uploaded as one JSONL file and queued as a batch."""
+    openai_client.files.create.return_value.id = "file-123"
+    openai_client.batches.create.return_value.id = "batch-123"
+
+    batch_id = summarize_bulk(["a", "b"])
+
+    assert batch_id == "batch-123"
+    _, upload = openai_client.files.create.call_args[1]["file"]
+    lines = [orjson.loads(line) for line in upload.splitlines()]
+    assert [line["custom_id"] for line in lines] == ["0", "1"]
+    assert lines[1]["body"]["messages"][1]["content"].endswith("\n\nb")
+    openai_client.batches.create.assert_called_once_with(
+        input_file_id="file-123",
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+
+def _output_line(custom_id, status_code, body):
+    """Build one line of a Batch API output file."""
+    return orjson.dumps(
+        {
+            "custom_id": custom_id,
+            "response": {"status_code": status_code, "body": body},
+        }
+    )
+
+
+def test_collect_bulk_orders_results(monkeypatch, openai_client):
+    """Test bulk results are waited for and returned in submission order."""
+    sleeps = []
+    monkeypatch.setattr(summarizer.time, "sleep", sleeps.append)
+    pending = SimpleNamespace(status="in_progress")
+    done = SimpleNamespace(
+        status="completed",
+        output_file_id="out",
+        error_file_id=None,
+        request_counts=SimpleNamespace(total=3),
+    )
+    openai_client.batches.retrieve.side_effect = [pending, done]
+    openai_client.files.content.return_value.content = b"\n".join(
+        [
+            _output_line(
+                "1", 200, {"choices": [{"message": {"content": "Summary b"}}]}
+            ),
+            _output_line(
+                "0", 200, {"choices": [{"message": {"content": "Summary a"}}]}
+            ),
+            _output_line("2", 429, {"error": {"message": "Rate limited"}}),
+        ]
+    )
+
+    result = collect_bulk("batch-123")
+
+    assert result == [
+        "Summary a",
+        "Summary b",
+        "Error generating summary: Rate limited",
+    ]
+    assert sleeps == [30.0]
+    openai_client.files.content.assert_called_once_with("out")
+
+
+def test_collect_bulk_without_request_counts(openai_client):
+    """Test results are collected when the batch reports no request counts."""
+    openai_client.batches.retrieve.return_value = SimpleNamespace(
+        status="completed",
+        output_file_id="out",
+        error_file_id=None,
+        request_counts=None,
+    )
+    openai_client.files.content.return_value.content = b"\n".join(
+        [
+            _output_line(
+                "2", 200, {"choices": [{"message": {"content": "Summary c"}}]}
+            ),
+            _output_line("0", 200, {}),
+        ]
+    )
+
+    assert collect_bulk("batch-123") == [
+        "No content returned",
+        "Error generating summary: missing from batch output",
+        "Summary c",
+    ]
+
+
+def test_collect_bulk_failed_batch(openai_client):
+    """Test a batch that didn't complete raises instead of returning summaries."""
+    openai_client.batches.retrieve.return_value = SimpleNamespace(status="expired")
+
+    with pytest.raises(RuntimeError, match="batch-123 expired"):
+        collect_bulk("batch-123")
+
+
+def test_summarize_truncates_long_text(monkeypatch, openai_client):
+    """Test text longer than MAX_INPUT_CHARS is cut at a word boundary."""
+    monkeypatch.setattr(summarizer, "MAX_INPUT_CHARS", 12)
+
+    summarize("alpha beta gamma delta")
+
+    call_args = openai_client.chat.completions.create.call_args
+    assert call_args[1]["messages"][1]["content"].endswith("\n\nalpha beta")
+
+
+def test_summary_key_handles_whitespace_before_the_limit(monkeypatch):
+    """Test text whose first MAX_INPUT_CHARS characters are blank still truncates."""
+    monkeypatch.setattr(summarizer, "MAX_INPUT_CHARS", 12)
+
+    assert summarizer._truncate(" " * 12 + "x") == " " * 12
+    assert summary_key(summary_request(" " * 12 + "x")) == summary_key(
+        summary_request(" " * 12 + "y")
+    )
+
+
+def test_summarize_many_throttles_to_rate_limit(monkeypatch):
+    """Test throttled summaries wait once the per-minute budget is spent."""
+    clock = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(summarizer.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(summarizer.time, "sleep", sleep)
+    monkeypatch.setattr(summarizer, "summarize", lambda text: f"Summary of {text}")
+
+    result = summarize_many(["a", "b", "c"], max_workers=1, requests_per_minute=2)
+
+    assert result == ["Summary of a", "Summary of b", "Summary of c"]
+    assert sleeps == [30.0]
+
+
+def test_summarize_result_reports_usage(openai_client):
+    """Test summarize_result returns the summary with its token usage."""
+    mock_response = openai_client.chat.completions.create.return_value
+    mock_response.choices[0].message.content = "A summary."
+    mock_response.usage = SimpleNamespace(
+        prompt_tokens=120,
+        completion_tokens=40,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=64),
+    )
+
+    result = summarize_result("Test content")
+
+    assert result == Summary(
+        text="A summary.",
+        model="gpt-4o-mini",
+        prompt_tokens=120,
+        completion_tokens=40,
+        cached_tokens=64,
+    )
 
-@patch("src.v2_ai_mcp.summarizer.OpenAI")
-def test_summarize_empty_content(mock_openai):
-    """Test summarizing empty content."""
-    mock_client = MagicMock()
-    mock_openai.return_value = mock_client
 
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = "No content to summarize."
-    mock_client.chat.completions.create.return_value = mock_response
+def test_summarize_result_error(openai_client):
+    """Test a failed request sets error instead of raising."""
+    openai_client.chat.completions.create.side_effect = Exception("API Error")
 
-    result = summarize("")
+    result = summarize_result("Test content")
 
-    assert result == "No content to summarize."
-    mock_client.chat.completions.create.assert_called_once()
+    assert result.error == "API Error"
+    assert result.text == "Error generating summary: API Error"